@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import threading
+from contextlib import contextmanager
 from enum import Enum, auto
-from typing import TYPE_CHECKING, Callable, Optional
+from typing import TYPE_CHECKING, Callable, Iterator, Optional, Set
 
 from voiceassistant.utils.log import get_logger
 
@@ -48,6 +50,34 @@ class Addon:
             _LOGGER.exception(f"Unexpected {self.name} addon exception")
 
 
+class ActivityTracker:
+    """Track which core attributes, e.g. speech output and processing, are running.
+
+    Attributes run by separate threads overlap, so add-ons changing
+    shared state (music volume, LEDs) check the others under a lock.
+    """
+
+    def __init__(self) -> None:
+        """Init."""
+        self._active: Set[CoreAttribute] = set()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def begin(self, core_attr: CoreAttribute) -> Iterator[Set[CoreAttribute]]:
+        """Mark `core_attr` as running, yield others running, hold lock meanwhile."""
+        with self._lock:
+            others = self._active - {core_attr}
+            self._active.add(core_attr)
+            yield others
+
+    @contextmanager
+    def end(self, core_attr: CoreAttribute) -> Iterator[Set[CoreAttribute]]:
+        """Mark `core_attr` as stopped, yield others running, hold lock meanwhile."""
+        with self._lock:
+            self._active.discard(core_attr)
+            yield set(self._active)
+
+
 def addon_begin(core_attr: CoreAttribute, name: Optional[str] = None) -> Callable:
     """Wrap add-on begin function into Addon object."""
 
@@ -66,4 +96,4 @@ def addon_end(core_attr: CoreAttribute, name: Optional[str] = None) -> Callable:
     return wrapper
 
 
-__all__ = ["Addon", "addon_begin", "addon_end"]
+__all__ = ["ActivityTracker", "Addon", "addon_begin", "addon_end"]
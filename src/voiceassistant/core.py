@@ -55,6 +55,9 @@ class VoiceAssistant:
         self.addons = AddonsComponent(self)
         self.integrations = IntegrationsComponent(self)
 
+        # fill speech cache without holding up keyword detection
+        self.interfaces.speech.presynthesize(self.integrations.phrases)
+
     def add_job(self, job: VassJob) -> None:
         """Add job for Voice Assistant to run."""
         if self._is_running:
@@ -37,5 +37,9 @@ class DeviceError(AssistantBaseException):
     """Unknown Device Error."""
 
 
+class AudioStreamClosed(AssistantBaseException):
+    """Audio Stream Closed Exception, e.g. once audio capture is reopened."""
+
+
 class DottedAttribureError(AttributeError, AssistantBaseException):
     """Dotted Dictionary Attribute Error."""
@@ -35,6 +35,7 @@ class IntegrationsComponent:
     def load_integrations(self) -> None:
         """Load enabled integrations."""
         integrations: List[Integration] = []
+        self.phrases: List[str] = []
 
         for module_name in _INTEGRATION_MODULES:
             if module_name not in self._vass.config:  # fix
@@ -72,6 +73,8 @@ class IntegrationsComponent:
                 for addon in addons:
                     self._vass.addons.add(addon)
 
+            self.phrases.extend(integration.phrases)
+
 
 def _load_integration(name: str, vass: VoiceAssistant) -> Integration:
     """Load integration by name."""
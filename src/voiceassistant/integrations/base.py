@@ -36,3 +36,8 @@ class Integration(abc.ABC):
     def regex_intents(self) -> List[RegexIntent]:
         """Return list of regex intents implemented by integration."""
         return []
+
+    @property
+    def phrases(self) -> List[str]:
+        """Return list of phrases pronounced by integration, synthesized ahead of time."""
+        return []
@@ -4,7 +4,6 @@ from __future__ import annotations
 
 import os
 import random
-import subprocess
 from datetime import datetime
 from functools import lru_cache
 from typing import TYPE_CHECKING, List, Union
@@ -18,6 +17,7 @@ from voiceassistant.integrations.base import Integration
 from voiceassistant.nlp.regex import RegexIntent
 from voiceassistant.skills.create import Action, Skill, action, skill
 from voiceassistant.utils.log import get_logger
+from voiceassistant.utils.scheduler import Priority
 
 if TYPE_CHECKING:
     from voiceassistant.config import Config
@@ -29,6 +29,8 @@ _LOGGER = get_logger(__name__)
 
 NLP_DATAFILE = f"{DATA_DIR}/nlp/regex.yaml"
 
+RELOADED_PHRASE = "I am now reloaded"
+
 
 def setup(vass: VoiceAssistant, config: Config) -> Integration:
     """Set up general functionality integration."""
@@ -67,6 +69,14 @@ class GeneralFunctionality(Integration):
 
         return [react_to_keyword]
 
+    @property
+    def phrases(self) -> List[str]:
+        """Return list of phrases pronounced by integration, synthesized ahead of time."""
+        phrases = [RELOADED_PHRASE]
+        if "sound" not in self._config.triggerword:
+            phrases.extend(self._config.triggerword.get("replies", []))
+        return phrases
+
     @property
     def regex_intents(self) -> List[RegexIntent]:
         """Return list of regex intents implemented by integration."""
@@ -87,17 +97,17 @@ def _do_not_react(vass: VoiceAssistant) -> None:
 def _react_by_random_phrase(vass: VoiceAssistant) -> None:
     """React to trigger word by a random reply phrase."""
     _LOGGER.info("Keyword detected")
-    vass.interfaces.speech.output(text=random.choice(vass.config.triggerword.replies), cache=True)
+    vass.interfaces.speech.enqueue_output(
+        random.choice(vass.config.triggerword.replies), cache=True, priority=Priority.HIGH
+    )
 
 
 @addon_end(CoreAttribute.KEYWORD_WAIT, name="keyword_react")
 def _react_by_sound(vass: VoiceAssistant) -> None:
     """React to trigger detection word."""
     _LOGGER.info("Keyword detected")
-    subprocess.Popen(
-        ["mpg123", _get_soundfile_path(vass.config.triggerword.sound)],
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.STDOUT,
+    vass.interfaces.speech.enqueue_sound(
+        _get_soundfile_path(vass.config.triggerword.sound), priority=Priority.HIGH
     )
 
 
@@ -139,7 +149,7 @@ def reload_vass(vass: VoiceAssistant, interface: InterfaceIO) -> None:
     """Reload Voice Assistant."""
     try:
         vass.load_components()
-        interface.output("I am now reloaded")
+        interface.output(RELOADED_PHRASE)
     except yaml.scanner.ScannerError:
         interface.output("Aborting, configuration YAML file is invalid.")
 
@@ -71,3 +71,12 @@ class HomeAssistant(Integration):
     def regex_intents(self) -> List[RegexIntent]:
         """Return list of hass-regex-intents."""
         return [skill.get_intent(self._vass) for skill in SKILLS]
+
+    @property
+    def phrases(self) -> List[str]:
+        """Return replies to turning on and off every entity."""
+        return [
+            f"{name}'s {state}"
+            for name in self._vass.data[DOMAIN][NAME_TO_ENTITY]
+            for state in ("on", "off")
+        ]
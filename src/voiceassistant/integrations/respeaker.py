@@ -13,7 +13,13 @@ import time
 from contextlib import suppress
 from typing import TYPE_CHECKING, List
 
-from voiceassistant.addons.create import Addon, CoreAttribute, addon_begin, addon_end
+from voiceassistant.addons.create import (
+    ActivityTracker,
+    Addon,
+    CoreAttribute,
+    addon_begin,
+    addon_end,
+)
 from voiceassistant.exceptions import IntegrationError
 from voiceassistant.utils.log import get_logger
 
@@ -32,15 +38,7 @@ _LOGGER = get_logger(__name__)
 
 
 DOMAIN = "respeaker"
-RING_STATE = "ring_state"
-
-
-class PixelRingState:
-    """Host pixel ring states."""
-
-    OFF = 0
-    SPEAK = 1
-    THINK = 2
+ACTIVITY = "activity"
 
 
 def setup(vass: VoiceAssistant, config: Config) -> Integration:
@@ -67,7 +65,7 @@ def setup(vass: VoiceAssistant, config: Config) -> Integration:
     pixel_ring.off()
 
     vass.data[DOMAIN] = {}
-    vass.data[DOMAIN][RING_STATE] = PixelRingState.OFF
+    vass.data[DOMAIN][ACTIVITY] = ActivityTracker()
 
     return RespeakerMicrophoneArray()
 
@@ -86,28 +84,32 @@ class RespeakerMicrophoneArray(Integration):
 @addon_begin(CoreAttribute.SPEECH_PROCESSING)
 def processing_starts(vass: VoiceAssistant) -> None:
     """Do before NLP starts."""
-    pixel_ring.speak()
-    vass.data[DOMAIN][RING_STATE] = PixelRingState.SPEAK
+    with vass.data[DOMAIN][ACTIVITY].begin(CoreAttribute.SPEECH_PROCESSING) as others:
+        if CoreAttribute.SPEECH_OUTPUT not in others:
+            pixel_ring.speak()
 
 
 @addon_end(CoreAttribute.SPEECH_PROCESSING)
 def processing_ends(vass: VoiceAssistant) -> None:
     """Do when NLP ends."""
     time.sleep(0.5)  # fix: LEDs on GPIO controlled microphones don't always turn off without wait
-    pixel_ring.off()
-    vass.data[DOMAIN][RING_STATE] = PixelRingState.OFF
+    with vass.data[DOMAIN][ACTIVITY].end(CoreAttribute.SPEECH_PROCESSING) as others:
+        if CoreAttribute.SPEECH_OUTPUT not in others:
+            pixel_ring.off()
 
 
 @addon_begin(CoreAttribute.SPEECH_OUTPUT)
 def tts_starts(vass: VoiceAssistant) -> None:
     """Do before voice output starts."""
-    pixel_ring.think()
+    with vass.data[DOMAIN][ACTIVITY].begin(CoreAttribute.SPEECH_OUTPUT):
+        pixel_ring.think()
 
 
 @addon_end(CoreAttribute.SPEECH_OUTPUT)
 def tts_ends(vass: VoiceAssistant) -> None:
     """Do when voice output ends."""
-    if vass.data[DOMAIN][RING_STATE] == PixelRingState.SPEAK:
-        pixel_ring.speak()
-    else:
-        pixel_ring.off()
+    with vass.data[DOMAIN][ACTIVITY].end(CoreAttribute.SPEECH_OUTPUT) as others:
+        if CoreAttribute.SPEECH_PROCESSING in others:
+            pixel_ring.speak()
+        else:
+            pixel_ring.off()
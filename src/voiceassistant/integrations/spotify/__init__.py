@@ -5,7 +5,13 @@ from __future__ import annotations
 import re
 from typing import TYPE_CHECKING, List
 
-from voiceassistant.addons.create import Addon, CoreAttribute, addon_begin, addon_end
+from voiceassistant.addons.create import (
+    ActivityTracker,
+    Addon,
+    CoreAttribute,
+    addon_begin,
+    addon_end,
+)
 from voiceassistant.integrations.base import Integration
 from voiceassistant.skills.create import Action, Skill, action, skill
 
@@ -24,8 +30,17 @@ CONF_VOLUME_INCREMENT = "volume_increment"
 
 CLIENT = "client"
 VOLUME_LOWERED = "volume_lowered"
+ACTIVITY = "activity"
 ORIGINAL_VOLUME = "original_volume"
 
+REPLY_PLAY = "Let's go!"
+REPLY_MAX_VOLUME = "Volume is already at maximum"
+REPLY_PLAY_LIKED = "Favourites incoming"
+REPLY_PLAY_SIMILAR = "here's something similar"
+REPLY_PLAY_RECOMMENDED = "here's recommended"
+REPLY_ADD_TRACK = "Great! Adding it to your library"
+REPLY_ADD_ALBUM = "Adding this album to your library"
+
 
 def setup(vass: VoiceAssistant, config: Config) -> Integration:
     """Set up Spotify integration."""
@@ -38,6 +53,7 @@ def setup(vass: VoiceAssistant, config: Config) -> Integration:
     vass.data[DOMAIN] = {}
     vass.data[DOMAIN][CLIENT] = VassSpotify(vass, config)
     vass.data[DOMAIN][VOLUME_LOWERED] = False
+    vass.data[DOMAIN][ACTIVITY] = ActivityTracker()
     vass.data[DOMAIN][ORIGINAL_VOLUME] = 0
 
     return Spotify(vass, config)
@@ -92,12 +108,25 @@ class Spotify(Integration):
             increase_volume_listen,
         ]
 
+    @property
+    def phrases(self) -> List[str]:
+        """Return list of spotify replies."""
+        return [
+            REPLY_PLAY,
+            REPLY_MAX_VOLUME,
+            REPLY_PLAY_LIKED,
+            REPLY_PLAY_SIMILAR,
+            REPLY_PLAY_RECOMMENDED,
+            REPLY_ADD_TRACK,
+            REPLY_ADD_ALBUM,
+        ]
+
 
 @skill("music-play")
 def play(vass: VoiceAssistant, entities: DottedDict, interface: InterfaceIO) -> None:
     """Start playback."""
     vass.data[DOMAIN][CLIENT].play()
-    interface.output("Let's go!")
+    interface.output(REPLY_PLAY)
 
 
 @skill("music-pause")
@@ -134,7 +163,7 @@ def volume_up(vass: VoiceAssistant, entities: DottedDict, interface: InterfaceIO
     )
 
     if volume == 100:
-        interface.output("Volume is already at maximum")
+        interface.output(REPLY_MAX_VOLUME)
         return
     new_volume = volume + volume_increment
     new_volume = 100 if new_volume > 100 else new_volume
@@ -179,14 +208,14 @@ def set_volume(vass: VoiceAssistant, entities: DottedDict, interface: InterfaceI
 def play_liked(vass: VoiceAssistant, entities: DottedDict, interface: InterfaceIO) -> None:
     """Play liked tracks."""
     vass.data[DOMAIN][CLIENT].play_liked_tracks()
-    interface.output("Favourites incoming")
+    interface.output(REPLY_PLAY_LIKED)
 
 
 @skill("music-play-similar")
 def play_similar(vass: VoiceAssistant, entities: DottedDict, interface: InterfaceIO) -> None:
     """Play tracks similar to current."""
     vass.data[DOMAIN][CLIENT].play_similar_to_current()
-    interface.output("here's something similar")
+    interface.output(REPLY_PLAY_SIMILAR)
 
 
 @skill("music-play-recommended")
@@ -195,21 +224,21 @@ def play_recommended_tracks(
 ) -> None:
     """Play recommended tracks."""
     vass.data[DOMAIN][CLIENT].play_recommended_tracks()
-    interface.output("here's recommended")
+    interface.output(REPLY_PLAY_RECOMMENDED)
 
 
 @skill("music-add-current-track")
 def add_current_track(vass: VoiceAssistant, entities: DottedDict, interface: InterfaceIO) -> None:
     """Add curent track to liked."""
     vass.data[DOMAIN][CLIENT].add_current_track()
-    interface.output("Great! Adding it to your library")
+    interface.output(REPLY_ADD_TRACK)
 
 
 @skill("music-add-current-album")
 def add_current_album(vass: VoiceAssistant, entities: DottedDict, interface: InterfaceIO) -> None:
     """Add current album to liked."""
     vass.data[DOMAIN][CLIENT].add_current_album()
-    interface.output("Adding this album to your library")
+    interface.output(REPLY_ADD_ALBUM)
 
 
 @skill("music-play-current-artist")
@@ -268,25 +297,25 @@ def search_and_play_playlist(
 @addon_begin(CoreAttribute.SPEECH_OUTPUT)
 def lower_volume_output(vass: VoiceAssistant) -> None:
     """Lower volume when Voice Assistant is speaking."""
-    _lower_volume(vass)
+    _lower_volume(vass, CoreAttribute.SPEECH_OUTPUT)
 
 
 @addon_begin(CoreAttribute.SPEECH_PROCESSING)
 def lower_volume_listen(vass: VoiceAssistant) -> None:
     """Lower volume when Voice Assistant is listening."""
-    _lower_volume(vass)
+    _lower_volume(vass, CoreAttribute.SPEECH_PROCESSING)
 
 
 @addon_end(CoreAttribute.SPEECH_OUTPUT)
 def increase_volume_output(vass: VoiceAssistant) -> None:
     """Increase volume back when Voice Assistant stopped speaking."""
-    _increase_volume_back(vass)
+    _increase_volume_back(vass, CoreAttribute.SPEECH_OUTPUT)
 
 
 @addon_end(CoreAttribute.SPEECH_PROCESSING)
 def increase_volume_listen(vass: VoiceAssistant) -> None:
     """Increase volume back when Voice Assistant stopped listening."""
-    _increase_volume_back(vass)
+    _increase_volume_back(vass, CoreAttribute.SPEECH_PROCESSING)
 
 
 @action("search_and_play")
@@ -302,24 +331,27 @@ def _say_track_description(vass: VoiceAssistant, interface: InterfaceIO) -> None
         interface.output(f"Playing {track_description}")
 
 
-def _lower_volume(vass: VoiceAssistant) -> None:
-    """Lower Spotify volume."""
+def _lower_volume(vass: VoiceAssistant, core_attr: CoreAttribute) -> None:
+    """Lower Spotify volume once `core_attr` starts."""
     muffle_factor = vass.config[DOMAIN][CONF_MUFFLE_FACTOR]
 
-    if not vass.data[DOMAIN][VOLUME_LOWERED]:
-        playback_volume = vass.data[DOMAIN][CLIENT].get_volume()
-        if playback_volume is None:
-            return
-        vass.data[DOMAIN][ORIGINAL_VOLUME] = playback_volume
-        vass.data[DOMAIN][CLIENT].set_volume(int(playback_volume * muffle_factor))
-        vass.data[DOMAIN][VOLUME_LOWERED] = True
-
-
-def _increase_volume_back(vass: VoiceAssistant) -> None:
-    """Increase Spotify volume back to original value."""
-    if vass.data[DOMAIN][VOLUME_LOWERED]:
-        vass.data[DOMAIN][CLIENT].set_volume(vass.data[DOMAIN][ORIGINAL_VOLUME])
-        vass.data[DOMAIN][VOLUME_LOWERED] = False
+    with vass.data[DOMAIN][ACTIVITY].begin(core_attr):
+        if not vass.data[DOMAIN][VOLUME_LOWERED]:
+            playback_volume = vass.data[DOMAIN][CLIENT].get_volume()
+            if playback_volume is None:
+                return
+            vass.data[DOMAIN][ORIGINAL_VOLUME] = playback_volume
+            vass.data[DOMAIN][CLIENT].set_volume(int(playback_volume * muffle_factor))
+            vass.data[DOMAIN][VOLUME_LOWERED] = True
+
+
+def _increase_volume_back(vass: VoiceAssistant, core_attr: CoreAttribute) -> None:
+    """Increase Spotify volume back to original value once `core_attr` and others stop."""
+    with vass.data[DOMAIN][ACTIVITY].end(core_attr) as others:
+        if vass.data[DOMAIN][VOLUME_LOWERED] and not others:
+            vass.data[DOMAIN][CLIENT].set_volume(vass.data[DOMAIN][ORIGINAL_VOLUME])
+            vass.data[DOMAIN][VOLUME_LOWERED] = False
+    vass.data[DOMAIN][ACTIVITY] = ActivityTracker()
 
 
 __all__ = ["Spotify"]
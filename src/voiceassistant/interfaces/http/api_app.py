@@ -12,6 +12,7 @@ from voiceassistant.exceptions import ConfigValidationError, SkillError
 from voiceassistant.utils import volume
 from voiceassistant.utils.datastruct import DottedDict
 from voiceassistant.utils.network import get_uuid
+from voiceassistant.utils.scheduler import Priority
 from voiceassistant.version import __version__
 
 from .auth import authorized
@@ -41,25 +42,39 @@ def api_factory(vass: VoiceAssistant, app: Flask) -> Flask:
     @app.route(f"/{name}/say", methods=["POST"])
     @authorized
     def say() -> Response:
-        """Pronounce text.
+        """Queue text to be pronounced, without waiting for it.
 
         Sample payload:
-        {"text": "Hello, World"}
+        {"text": "Hello, World", "priority": "high"}
         """
         try:
             payload = request.get_json() or {}
             text = payload["text"]
             cache = payload.get("cache", False)
-
-            if isinstance(text, list):
-                vass.interfaces.speech.output(random.choice(text), cache)
-            else:
-                vass.interfaces.speech.output(text, cache)
-
-            return Response(status=200)
         except (KeyError, TypeError):
             return Response("Payload must have 'text' key", status=406)
 
+        try:
+            priority = Priority[payload.get("priority", "normal").upper()]
+        except (KeyError, AttributeError):
+            return Response("Priority must be one of: high, normal, low", status=406)
+
+        if isinstance(text, list) and text:
+            text = random.choice(text)
+        if not isinstance(text, str):
+            return Response("Text must be a string or a list of strings", status=406)
+
+        vass.interfaces.speech.enqueue_output(text, cache, priority)
+
+        return Response(status=200)
+
+    @app.route(f"/{name}/say", methods=["DELETE"])
+    @authorized
+    def cancel_say() -> Response:
+        """Stop current speech output and drop queued ones."""
+        vass.interfaces.speech.cancel_output()
+        return Response(status=200)
+
     @app.route(f"/{name}/reload", methods=["GET"])
     @authorized
     def reload() -> Response:
@@ -208,4 +223,19 @@ def api_factory(vass: VoiceAssistant, app: Flask) -> Flask:
 
         return Response(status=200)
 
+    #
+    # Metrics
+    #
+
+    @app.route(f"/{name}/metrics", methods=["GET"])
+    @authorized
+    def get_metrics() -> Response:
+        """Get audio capture pipeline health and text-to-speech cache metrics."""
+        return jsonify(
+            {
+                "capture": vass.interfaces.speech.capture_metrics,
+                "tts_cache": vass.interfaces.speech.tts_cache_metrics,
+            }
+        )
+
     return app
@@ -1,78 +1,291 @@
-"""Voice interface subpackage."""
+"""Voice interface subpackage.
+
+Sample config:
+
+barge_in:
+  enabled: true
+  filter_ms: 128
+  step_size: 0.5
+"""
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import functools
+import subprocess
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, Iterable, Optional, Tuple
 
 from voiceassistant import addons
-from voiceassistant.exceptions import UserCommunicateException
+from voiceassistant.exceptions import AudioStreamClosed, UserCommunicateException
 from voiceassistant.interfaces.base import InterfaceIO
 from voiceassistant.utils.debug import print_and_flush
 from voiceassistant.utils.log import get_logger
+from voiceassistant.utils.scheduler import Job, Priority, SerialScheduler
 
+from .audio_output import AudioOutput
+from .audio_source import Playback, create_audio_source
 from .keyword import KeywordDetector
 from .microphone_stream import (
+    BUFFER_SECONDS,
+    AudioCaptureEngine,
     MicrophoneStream,
     microphone_is_paused,
     pause_microphone_stream,
     resume_microphone_stream,
 )
 from .speech_to_text import SpeechToText
+from .text_to_speech import SAMPLE_RATE as TTS_SAMPLE_RATE
 from .text_to_speech import TextToSpeech
+from .vad import VoiceActivityDetector
 
 if TYPE_CHECKING:
     from voiceassistant.core import VoiceAssistant
 
 _LOGGER = get_logger(__name__)
 
+ERROR_PHRASE = "Error occured"
+SOUND_POLL_INTERVAL = 0.05  # seconds between checks if sound playback is cancelled
+
 
 class SpeechInterface(InterfaceIO):
     """Speech interface."""
 
+    sst: SpeechToText
+    tts: TextToSpeech
+
     def __init__(self, vass: VoiceAssistant) -> None:
         """Init."""
         self._vass = vass
+        self._capture: Optional[AudioCaptureEngine] = None
+        # notified once capture engine is reopened
+        self._capture_ready = threading.Condition()
+        self._capture_config: Optional[Tuple] = None
+        self._stream: Optional[MicrophoneStream] = None
+        self._trigger_time: Optional[float] = None
+        self._not_triggered = True
+        self._waiting_for_trigger = False
+        self._playback: Optional[Playback] = None
+        # end of keyword spoken during speech output
+        self._barge_in_position: Optional[int] = None
+        # listens for keyword during speech output until keyword waiting loop takes over
+        self._barge_in_monitor: Optional[MicrophoneStream] = None
+        self._barge_in_lock = threading.Lock()
+        # kept open across reloads
+        self._audio_output = AudioOutput(TTS_SAMPLE_RATE)
+        # outputs of all callers are played one at a time
+        self._output_scheduler = SerialScheduler("speech-output", interrupt=self._interrupt_output)
         self.reload()
 
     def reload(self) -> None:
         """Reload speech components."""
         self.keyword_detector = KeywordDetector(self._vass)
-        self.sst = SpeechToText(self._vass, self.keyword_detector.rate)
-        self.tts = TextToSpeech(self._vass)
+        self.vad = VoiceActivityDetector(self._vass, self.keyword_detector.rate)
+        if hasattr(self, "sst"):
+            self.sst.close()
+        self.sst = SpeechToText(self._vass, self.keyword_detector.rate, self.vad)
+        if hasattr(self, "tts"):
+            self.tts.close()
+        self.tts = TextToSpeech(self._vass, self._audio_output)
         self._mic_should_be_on = True
 
+        barge_in_config = self._vass.config.get("barge_in") or {}
+        self._barge_in_detector: Optional[KeywordDetector] = None
+        if barge_in_config.get("enabled", False):
+            # keyword is detected during output from a separate consumer
+            self._barge_in_detector = KeywordDetector(self._vass)
+
+        self._reload_capture()
+
+    def _reload_capture(self) -> None:
+        """Open audio capture engine unless an open one fits current config."""
+        rate = self.keyword_detector.rate
+        chunk = self.keyword_detector.chunk_size
+        capture_config = (
+            rate,
+            chunk,
+            self._vass.config.get("audio_input"),
+            self._vass.config.get("barge_in"),
+        )
+
+        capture = self._capture
+        if capture and capture_config == self._capture_config:
+            return
+
+        with self._capture_ready:
+            self._capture = None
+        with self._barge_in_lock:
+            # position in audio of closed engine
+            self._barge_in_position = None
+        if self._playback:
+            self._playback.cancel()
+        if capture:
+            # closed first, input devices such as ALSA `hw:` ones can't be opened twice
+            capture.close()
+
+        _LOGGER.info("Opening audio capture engine")
+        playback = Playback(chunk) if self._barge_in_detector else None
+        engine = AudioCaptureEngine(
+            source=create_audio_source(self._vass.config, rate, chunk, playback),
+            buffer_seconds=self._prerecord_seconds + BUFFER_SECONDS,
+        )
+        with self._capture_ready:
+            self._capture = engine
+            self._capture_config = capture_config
+            self._playback = playback
+            self._capture_ready.notify_all()
+
+    def _wait_for_capture(self) -> AudioCaptureEngine:
+        """Get audio capture engine, wait for it while it is being reopened."""
+        with self._capture_ready:
+            self._capture_ready.wait_for(lambda: self._capture is not None)
+            assert self._capture
+            return self._capture
+
+    def presynthesize(self, phrases: Iterable[str]) -> None:
+        """Prepare speech output of `phrases` in background, along with own phrases."""
+        self.tts.presynthesize([ERROR_PHRASE, *phrases])
+
+    @property
+    def _prerecord_seconds(self) -> float:
+        return self._vass.config.get("prerecord_seconds", 3)  # type: ignore
+
     def input(self) -> str:
         """Recognize speech."""
         pass
 
-    @addons.expose(addons.CoreAttribute.SPEECH_OUTPUT)
     def output(self, text: str, cache: bool = False) -> None:
-        """Pronounce text."""
+        """Pronounce text, without waiting for it to be pronounced."""
+        self.enqueue_output(text, cache)
+
+    def enqueue_output(
+        self, text: str, cache: bool = False, priority: Priority = Priority.NORMAL
+    ) -> Job:
+        """Queue `text` to be pronounced after outputs of higher or the same priority.
+
+        Text already waiting in queue is pronounced once.
+
+        Returns:
+            job to wait for or cancel
+        """
+        return self._output_scheduler.submit(
+            text, functools.partial(self._speak, text, cache), priority
+        )
+
+    def enqueue_sound(self, path: str, priority: Priority = Priority.NORMAL) -> Job:
+        """Queue MP3 file at `path` to be played in turn with speech outputs.
+
+        Returns:
+            job to wait for or cancel
+        """
+        return self._output_scheduler.submit(
+            ("sound", path), functools.partial(self._play_sound, path), priority
+        )
+
+    def _play_sound(self, path: str, cancelled: threading.Event) -> None:
+        """Play MP3 file at `path`, block until it's played or `cancelled`."""
+        process = subprocess.Popen(
+            ["mpg123", path], stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT
+        )
+        while process.poll() is None:
+            if cancelled.wait(SOUND_POLL_INTERVAL):
+                process.terminate()
+                break
+        process.wait()
+
+    def cancel_output(self) -> None:
+        """Stop current speech output and drop queued ones."""
+        self._output_scheduler.cancel_all()
+
+    def _interrupt_output(self) -> None:
+        """Stop speech output of a cancelled job."""
+        if self._playback:
+            self._playback.cancel()
+
+    @addons.expose(addons.CoreAttribute.SPEECH_OUTPUT)
+    def _speak(self, text: str, cache: bool, cancelled: threading.Event) -> None:
+        """Pronounce `text`, block until it's pronounced or `cancelled`."""
+        if self._playback:
+            self._output_with_barge_in(text, cache, cancelled)
+            return
+
         pause_microphone_stream()
-        self.tts.say(text, cache)
-        if self._mic_should_be_on:
-            resume_microphone_stream()
+        try:
+            self.tts.say(text, cache, cancelled)
+        finally:
+            if self._mic_should_be_on:
+                resume_microphone_stream()
+
+    def _output_with_barge_in(self, text: str, cache: bool, cancelled: threading.Event) -> None:
+        """Pronounce `text` while listening for keyword to interrupt it, or until `cancelled`."""
+        assert self._playback and self._barge_in_detector
+        capture = self._wait_for_capture()
+        playback = self._playback
+        detector = self._barge_in_detector
+        audio = self.tts.speech(text, cache, capture.rate)
+
+        monitor = None
+        with self._barge_in_lock:
+            if not self._waiting_for_trigger:
+                # keyword waiting loop is busy, so listen for keyword separately
+                detector.reset()
+                monitor = capture.subscribe(
+                    functools.partial(self._detect_barge_in, detector, playback), name="barge-in"
+                )
+                self._barge_in_monitor = monitor
+
+        try:
+            if not playback.play(audio, cancelled) and not cancelled.is_set():
+                _LOGGER.info("Speech output interrupted by keyword")
+        finally:
+            if monitor:
+                monitor.close()
+
+    def _detect_barge_in(
+        self,
+        detector: KeywordDetector,
+        playback: Playback,
+        monitor: MicrophoneStream,
+        chunk: memoryview,
+    ) -> None:
+        """Stop speech output once keyword is detected in `chunk` read by `monitor`."""
+        if detector.not_detected(chunk):
+            return
+
+        with self._barge_in_lock:
+            if monitor is not self._barge_in_monitor:
+                # keyword waiting loop took over, it hears the keyword as well
+                return
+            self._barge_in_position = monitor.position - detector.trailing_bytes
+            self._barge_in_monitor = None
+        playback.cancel()
+        monitor.close()
 
     def run(self) -> None:
         """Listen for keyword and process speech."""
         while True:
             try:
-                _LOGGER.info("Creating new microphone stream")
-                with MicrophoneStream(
-                    rate=self.keyword_detector.rate,
-                    chunk=self.keyword_detector.chunk_size,
-                    rolling_window_sec=self._vass.config.get("prerecord_seconds", 3),
-                ) as stream:
+                capture = self._wait_for_capture()
+                with capture.stream(self._prerecord_seconds) as stream:
+                    self._stream = stream
                     self._wait_for_trigger(stream)
                     self.process_speech(stream)
+            except AudioStreamClosed:
+                _LOGGER.debug("Audio capture reopened, waiting for keyword again")
             except Exception:
                 _LOGGER.critical("Unexpected exception raised in speech interface loop")
                 raise
 
     def trigger(self) -> None:
-        """Trigger/start speech interface."""
+        """Trigger/start speech interface.
+
+        Wakes up keyword waiting loop immediately, even if no audio arrives.
+        """
         if not self.microphone_is_muted:
+            self._trigger_time = time.monotonic()
             self._not_triggered = False
+            if self._stream:
+                self._stream.interrupt()
 
     @addons.expose(addons.CoreAttribute.SPEECH_PROCESSING)
     def process_speech(self, stream: MicrophoneStream) -> None:
@@ -82,17 +295,96 @@ class SpeechInterface(InterfaceIO):
                 for transcript in self.sst.recognize_from_stream(stream):
                     print_and_flush(transcript)
                     handler.handle_next(transcript=transcript)
+                    if handler.is_complete:
+                        self.sst.finish()
+                    elif handler.is_pending:
+                        self.sst.expect_more()
+                    if self._barge_in_position is not None:
+                        # user started a new request
+                        break
         except UserCommunicateException as e:
-            self.output(str(e))
+            self.enqueue_output(str(e), priority=Priority.HIGH)
         except Exception:
             _LOGGER.exception("Unexpected exception raised while processing speech")
-            self.output("Error occured", cache=True)
+            self.enqueue_output(ERROR_PHRASE, cache=True, priority=Priority.HIGH)
 
     @addons.expose(addons.CoreAttribute.KEYWORD_WAIT)
     def _wait_for_trigger(self, stream: MicrophoneStream) -> None:
+        with self._barge_in_lock:
+            position, self._barge_in_position = self._barge_in_position, None
+            monitor, self._barge_in_monitor = self._barge_in_monitor, None
+            self._waiting_for_trigger = position is None
+        if monitor:
+            monitor.close()
+
+        if position is not None:
+            _LOGGER.info("Keyword detected during speech output")
+            keyword_bytes = self._rewind_to_speech_start(stream, position)
+            self.sst.prepare(stream, keyword_bytes)
+            return
+
+        self.sst.warm_up()
+
         self._not_triggered = True
-        while self._not_triggered and self.keyword_detector.not_detected(stream.read()):
-            pass
+        self._trigger_time = None
+        self.keyword_detector.reset()
+        keyword_end = None
+        while self._not_triggered and not stream.closed:
+            if not self.keyword_detector.not_detected(stream.read()):
+                keyword_end = stream.position - self.keyword_detector.trailing_bytes
+                break
+        with self._barge_in_lock:
+            self._waiting_for_trigger = False
+            # keyword is handled by this loop, not replayed as heard during output
+            self._barge_in_position = None
+
+        if stream.closed:
+            # keyword add-ons must not react as if keyword was spoken
+            raise AudioStreamClosed("Audio capture closed while waiting for keyword")
+
+        if self._playback:
+            self._playback.cancel()
+
+        if self._trigger_time is not None:
+            latency = time.monotonic() - self._trigger_time
+            _LOGGER.info(f"Triggered remotely, took effect in {latency * 1000:.1f} ms")
+
+        keyword_bytes = self._rewind_to_speech_start(stream, keyword_end)
+        # recognition starts while keyword reaction addons run
+        self.sst.prepare(stream, keyword_bytes)
+
+    def _rewind_to_speech_start(self, stream: MicrophoneStream, keyword_end: Optional[int]) -> int:
+        """Move `stream` back to where speech to recognize starts.
+
+        Depending on `prerecord_start` config it is either the onset of
+        utterance with the keyword, the keyword end or the start
+        of the whole pre-record window.
+
+        Returns:
+            number of bytes to read up to the keyword end, 0 if there is no keyword
+        """
+        prerecord_start = self._vass.config.get("prerecord_start", "speech")
+        end = stream.position if keyword_end is None else keyword_end
+
+        if prerecord_start == "keyword":
+            stream.seek(end)
+        else:
+            window = stream.prerecorded(end)
+            onset = self.vad.find_onset(window) if prerecord_start == "speech" else 0
+            stream.seek(end - len(window) + onset)
+
+        _LOGGER.debug(f"Using {stream.seconds(stream.lag):.2f}s of prerecorded audio")
+        return max(keyword_end - stream.position, 0) if keyword_end is not None else 0
+
+    @property
+    def capture_metrics(self) -> Dict:
+        """Get audio capture pipeline health metrics."""
+        return self._wait_for_capture().metrics()
+
+    @property
+    def tts_cache_metrics(self) -> Dict:
+        """Get text-to-speech cache hit and miss counts and size."""
+        return self.tts.cache.stats()
 
     @property
     def microphone_is_muted(self) -> bool:
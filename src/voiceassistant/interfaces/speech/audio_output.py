@@ -0,0 +1,122 @@
+"""Audio output to default sound device."""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional
+
+from voiceassistant.utils.log import get_logger
+
+from .audio_source import SAMPLE_WIDTH
+
+_LOGGER = get_logger(__name__)
+
+
+@dataclass
+class OutputReport:
+    """Timing of audio played by audio output."""
+
+    time_to_first_sample: Optional[float]  # seconds, None if nothing played
+    duration: float  # seconds of audio played
+    interrupted: bool = False
+
+
+class AudioOutput:
+    """Persistent output stream playing 16-bit mono audio from memory.
+
+    Stream is opened on first use and kept open, so that playback
+    starts without opening the sound device every time.
+    """
+
+    def __init__(self, rate: int, chunk: int = 1024) -> None:
+        """Create audio output at `rate` with buffer of `chunk` samples."""
+        self.rate = rate
+        self._chunk = chunk
+        self._audio_interface: Any = None
+        self._audio_stream: Any = None
+        self._lock = threading.Lock()
+
+    def _open(self) -> None:
+        """Open output device unless it's open."""
+        if self._audio_stream:
+            return
+
+        # imported here so that headless setups can run without PortAudio
+        import pyaudio
+
+        self._audio_interface = pyaudio.PyAudio()
+        self._audio_stream = self._audio_interface.open(
+            format=pyaudio.paInt16,
+            channels=1,
+            rate=self.rate,
+            output=True,
+            frames_per_buffer=self._chunk,
+        )
+
+    def play(
+        self,
+        audio: Iterable[bytes],
+        start_time: Optional[float] = None,
+        cancelled: Optional[threading.Event] = None,
+    ) -> OutputReport:
+        """Play `audio` chunks as they are generated, block until played or `cancelled`.
+
+        Time to first sample is counted from `start_time`, when audio
+        was requested, or from now. It includes output device latency.
+        """
+        start_time = time.monotonic() if start_time is None else start_time
+        first_sample_time = None
+        played = 0
+        remainder = b""
+        interrupted = False
+
+        with self._lock:
+            self._open()
+            latency = self._audio_stream.get_output_latency()
+
+            for chunk in audio:
+                # chunks may split samples
+                data = remainder + bytes(chunk)
+                size = len(data) - len(data) % SAMPLE_WIDTH
+                data, remainder = data[:size], data[size:]
+                if not data:
+                    continue
+
+                if first_sample_time is None:
+                    first_sample_time = time.monotonic() + latency
+
+                # written in pieces of buffer size to stop soon once cancelled
+                for start in range(0, len(data), self._chunk * SAMPLE_WIDTH):
+                    if cancelled and cancelled.is_set():
+                        break
+                    piece = data[start : start + self._chunk * SAMPLE_WIDTH]
+                    self._audio_stream.write(piece)
+                    played += len(piece)
+
+                if cancelled and cancelled.is_set():
+                    interrupted = True
+                    break
+
+            if not interrupted:
+                # buffered audio is still playing
+                time.sleep(latency)
+
+        return OutputReport(
+            time_to_first_sample=(
+                first_sample_time - start_time if first_sample_time is not None else None
+            ),
+            duration=played / SAMPLE_WIDTH / self.rate,
+            interrupted=interrupted,
+        )
+
+    def close(self) -> None:
+        """Close output device."""
+        with self._lock:
+            if not self._audio_stream:
+                return
+            self._audio_stream.stop_stream()
+            self._audio_stream.close()
+            self._audio_interface.terminate()
+            self._audio_stream = None
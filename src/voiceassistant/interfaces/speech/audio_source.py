@@ -0,0 +1,477 @@
+"""Audio input sources for audio capture engine.
+
+Microphone is used by default, recorded WAV files can be used instead
+to run speech pipeline without a sound card.
+
+Multi-channel audio of microphone arrays is combined into mono audio
+by a beamformer steering towards the speaker, or by picking the loudest mic.
+
+Sources can also play audio in sync with recording, so that its echo
+is removed from recorded audio. WAV file source mixes simulated echo
+of played audio into the recordings.
+
+Sample config:
+
+audio_input:
+  channels: 4
+  beamforming:
+    mode: delay_and_sum  # or `select`
+    mics: [[-0.032, 0], [0, -0.032], [0.032, 0], [0, 0.032]]
+  wav:
+    files:
+      - /home/pi/recordings/turn_on_lights.wav
+    speed: 4
+    loop: true
+"""
+
+from __future__ import annotations
+
+import abc
+import math
+import threading
+import time
+import wave
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from voiceassistant.exceptions import ConfigValidationError
+from voiceassistant.utils.audio import (
+    ChannelSelector,
+    DelayAndSumBeamformer,
+    EchoCanceller,
+    deinterleave,
+    to_pcm16,
+)
+from voiceassistant.utils.log import get_logger
+
+if TYPE_CHECKING:
+    from voiceassistant.config import Config
+
+_LOGGER = get_logger(__name__)
+
+AudioCallback = Callable[[bytes], None]
+
+SAMPLE_WIDTH = 2  # bytes per sample of 16-bit audio
+
+# mic (x, y) positions in metres of ReSpeaker 4-Mic Array for Raspberry Pi
+RESPEAKER_4_MIC_POSITIONS = [[-0.032, 0], [0, -0.032], [0.032, 0], [0, 0.032]]
+
+DEFAULT_ECHO_FILTER_MS = 128
+DEFAULT_ECHO_STEP_SIZE = 0.5
+SIMULATED_ECHO_GAIN = 0.3
+PLAYBACK_POLL_INTERVAL = 0.05  # seconds between checks whether playback was cancelled
+# playback is dropped once source has taken no audio for this long, e.g. WAV input finished
+SOURCE_STOPPED_SECONDS = 1.0
+
+
+class Playback:
+    """Audio played by audio source in sync with recording.
+
+    Source takes one chunk of audio to play, or silence, for every chunk
+    it records, chunk taken last is the echo reference of recorded chunk.
+    """
+
+    def __init__(self, chunk: int) -> None:
+        """Create playback of mono audio in chunks of `chunk` samples."""
+        self._chunk_size = chunk * SAMPLE_WIDTH
+        self._silence = bytes(self._chunk_size)
+        self._audio = bytearray()
+        self._position = 0
+        # all audio to play is generated
+        self._complete = True
+        self._cancelled = False
+        self._condition = threading.Condition()
+        self._play_lock = threading.Lock()
+        self._chunk_taken_time = time.monotonic()
+        self.reference = self._silence
+
+    @property
+    def playing(self) -> bool:
+        """Return True if there is audio left to play, or being generated."""
+        return not self._complete or self._position < len(self._audio)
+
+    @property
+    def _source_running(self) -> bool:
+        """Return True if audio source keeps taking chunks to play."""
+        return time.monotonic() - self._chunk_taken_time < SOURCE_STOPPED_SECONDS
+
+    def _wait_for_source(self) -> None:
+        """Wait for audio source to take a chunk, drop audio if it stopped taking them."""
+        if self._source_running:
+            self._condition.wait(PLAYBACK_POLL_INTERVAL)
+        else:
+            _LOGGER.warning("Audio source stopped, speech output dropped")
+            self.cancel()
+
+    def play(self, audio: Iterable[bytes], cancelled: Optional[threading.Event] = None) -> bool:
+        """Play 16-bit mono `audio` chunks as they are generated.
+
+        Blocks until audio is played, cancelled by `cancel` or by setting
+        `cancelled`, even before playback starts, or until audio source
+        stops taking audio to play. Next chunk is taken once
+        the previous one is nearly played, silence is played while it is
+        being generated.
+
+        Returns:
+            True if audio was played completely
+        """
+        with self._play_lock:
+            with self._condition:
+                self._audio = bytearray()
+                self._position = 0
+                self._complete = False
+                self._cancelled = False
+
+            chunks = iter(audio)
+            while not (cancelled and cancelled.is_set()):
+                chunk = next(chunks, None)
+                with self._condition:
+                    if chunk is None or self._cancelled:
+                        break
+                    self._audio += chunk
+                    # take the next chunk once this one is nearly played, when it is due
+                    while len(self._audio) - self._position > self._chunk_size:
+                        if self._cancelled or (cancelled and cancelled.is_set()):
+                            break
+                        self._wait_for_source()
+
+            if cancelled and cancelled.is_set():
+                self.cancel()
+            with self._condition:
+                self._complete = True
+                while self.playing:
+                    self._wait_for_source()
+                return not self._cancelled
+
+    def cancel(self) -> None:
+        """Stop playing current audio."""
+        with self._condition:
+            self._cancelled = self.playing
+            self._audio = bytearray()
+            self._position = 0
+            self._condition.notify_all()
+
+    def next_chunk(self) -> bytes:
+        """Get next chunk of audio to play, padded with silence."""
+        with self._condition:
+            self._chunk_taken_time = time.monotonic()
+            chunk = b""
+            if self._complete or len(self._audio) - self._position >= self._chunk_size:
+                chunk = bytes(self._audio[self._position : self._position + self._chunk_size])
+                self._position += len(chunk)
+            self._condition.notify_all()
+
+        self.reference = chunk + self._silence[len(chunk) :]
+        return self.reference
+
+
+class AudioSource(abc.ABC):
+    """Source of 16-bit audio delivered in chunks of fixed size.
+
+    Audio of multiple channels is interleaved.
+    """
+
+    def __init__(
+        self, rate: int, chunk: int, channels: int = 1, playback: Optional[Playback] = None
+    ) -> None:
+        """Create audio source producing `chunk` samples at a time at `rate`.
+
+        Audio of `playback`, if given, is played while recording.
+        """
+        self.rate = rate
+        self.chunk = chunk
+        self.channels = channels
+        self.playback = playback
+        self._overflows = 0
+        self._input_latency = 0.0
+
+    @property
+    def overflows(self) -> int:
+        """Get number of times audio input overflowed and audio was lost."""
+        return self._overflows
+
+    @property
+    def input_latency(self) -> float:
+        """Get latest delay between recording audio and delivering it, in seconds."""
+        return self._input_latency
+
+    @abc.abstractmethod
+    def start(self, callback: AudioCallback) -> None:
+        """Start calling `callback` with every chunk of audio."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def close(self) -> None:
+        """Stop producing audio and release resources."""
+        raise NotImplementedError
+
+
+class MicrophoneSource(AudioSource):
+    """Audio recorded from default input device.
+
+    With playback, default output device is opened as a part
+    of the same full-duplex stream, played audio goes to all channels.
+    """
+
+    def start(self, callback: AudioCallback) -> None:
+        """Open input device."""
+        # imported here so that headless setups can run without PortAudio
+        import pyaudio
+
+        def stream_callback(
+            in_data: bytes, frame_count: int, time_info: Dict, status_flags: int
+        ) -> Tuple:
+            if status_flags & pyaudio.paInputOverflow:
+                self._overflows += 1
+            if time_info.get("input_buffer_adc_time"):
+                # some host APIs do not report timing, leaving it zero
+                self._input_latency = (
+                    time_info["current_time"] - time_info["input_buffer_adc_time"]
+                )
+
+            out_data = None
+            if self.playback:
+                out_data = self.playback.next_chunk()
+                if self.channels > 1:
+                    samples = np.frombuffer(out_data, dtype=np.int16)
+                    out_data = np.repeat(samples, self.channels).tobytes()
+
+            callback(in_data)
+            return out_data, pyaudio.paContinue
+
+        self._audio_interface = pyaudio.PyAudio()
+        self._audio_stream = self._audio_interface.open(
+            format=pyaudio.paInt16,
+            channels=self.channels,
+            rate=self.rate,
+            input=True,
+            output=self.playback is not None,
+            frames_per_buffer=self.chunk,
+            stream_callback=stream_callback,
+        )
+
+    def close(self) -> None:
+        """Close input device."""
+        self._audio_stream.stop_stream()
+        self._audio_stream.close()
+        self._audio_interface.terminate()
+
+
+class WavFileSource(AudioSource):
+    """Audio replayed from WAV files at real-time or accelerated speed.
+
+    Every file is followed by a second of silence,
+    so that speech endpointing works as with live audio.
+    """
+
+    def __init__(
+        self,
+        rate: int,
+        chunk: int,
+        files: List[str],
+        speed: float = 1.0,
+        loop: bool = False,
+        silence_seconds: float = 1.0,
+        channels: int = 1,
+        playback: Optional[Playback] = None,
+    ) -> None:
+        """Create WAV file source."""
+        super().__init__(rate, chunk, channels, playback)
+
+        if speed <= 0:
+            raise ConfigValidationError("WAV audio input speed must be positive")
+
+        self._recordings = [self._load(path) for path in files]
+        self._speed = speed
+        self._loop = loop
+        self._silence = bytes(int(silence_seconds * rate) * SAMPLE_WIDTH * channels)
+        self._closed = threading.Event()
+
+    def _load(self, path: str) -> bytes:
+        """Read audio frames from WAV file at `path`."""
+        with wave.open(path, "rb") as wav:
+            if (wav.getframerate(), wav.getsampwidth(), wav.getnchannels()) != (
+                self.rate,
+                SAMPLE_WIDTH,
+                self.channels,
+            ):
+                raise ConfigValidationError(
+                    f"WAV audio input must be 16-bit {self.channels} channel "
+                    f"{self.rate} Hz: {path}"
+                )
+            return wav.readframes(wav.getnframes())
+
+    def start(self, callback: AudioCallback) -> None:
+        """Start replaying files in a background thread."""
+        threading.Thread(target=self._replay, args=(callback,), daemon=True).start()
+
+    def _replay(self, callback: AudioCallback) -> None:
+        """Feed recordings to `callback` keeping real-time pace scaled by speed."""
+        chunk_size = self.chunk * SAMPLE_WIDTH * self.channels
+        chunk_duration = self.chunk / self.rate / self._speed
+        next_chunk_time = time.monotonic()
+
+        while not self._closed.is_set():
+            for recording in self._recordings:
+                audio = recording + self._silence
+                # last chunk is padded with silence to keep chunks of fixed size
+                audio += bytes(-len(audio) % chunk_size)
+
+                for start in range(0, len(audio), chunk_size):
+                    next_chunk_time += chunk_duration
+                    if self._closed.wait(max(next_chunk_time - time.monotonic(), 0)):
+                        return
+                    callback(self._mix_echo(audio[start : start + chunk_size]))
+
+            if not self._loop:
+                _LOGGER.info("WAV audio input finished")
+                return
+
+    def _mix_echo(self, chunk: bytes) -> bytes:
+        """Add echo of audio played one chunk earlier to recorded `chunk`."""
+        if not self.playback:
+            return chunk
+
+        echo = np.frombuffer(self.playback.reference, dtype=np.int16)
+        self.playback.next_chunk()
+        if not echo.any():
+            return chunk
+
+        recorded = deinterleave(chunk, self.channels)
+        return to_pcm16(recorded + SIMULATED_ECHO_GAIN * echo).T.tobytes()
+
+    def close(self) -> None:
+        """Stop replaying files."""
+        self._closed.set()
+
+
+class ProcessingSource(AudioSource):
+    """Audio of another source processed on the fly."""
+
+    def __init__(self, source: AudioSource) -> None:
+        """Create source processing audio of `source`."""
+        super().__init__(source.rate, source.chunk, playback=source.playback)
+        self._source = source
+
+    @property
+    def overflows(self) -> int:
+        """Get number of times audio input of underlying source overflowed."""
+        return self._source.overflows
+
+    @property
+    def input_latency(self) -> float:
+        """Get latest input latency of underlying source."""
+        return self._source.input_latency
+
+    def close(self) -> None:
+        """Close underlying source."""
+        self._source.close()
+
+
+class BeamformingSource(ProcessingSource):
+    """Mono audio combined from channels of multi-channel source."""
+
+    def __init__(
+        self,
+        source: AudioSource,
+        beamformer: Union[DelayAndSumBeamformer, ChannelSelector],
+        mic_channels: Optional[List[int]] = None,
+    ) -> None:
+        """Create beamforming source from `mic_channels` of `source`, all by default."""
+        super().__init__(source)
+        self._beamformer = beamformer
+        self._mic_channels = mic_channels or list(range(source.channels))
+
+    def start(self, callback: AudioCallback) -> None:
+        """Start source and combine its audio into mono."""
+
+        def beamform(in_data: bytes) -> None:
+            signals = deinterleave(in_data, self._source.channels)[self._mic_channels]
+            callback(self._beamformer.process(signals).tobytes())
+
+        self._source.start(beamform)
+
+
+class EchoCancellingSource(ProcessingSource):
+    """Mono audio with echo of audio played by source removed."""
+
+    def __init__(self, source: AudioSource, canceller: EchoCanceller) -> None:
+        """Create echo cancelling source from mono `source` with playback."""
+        super().__init__(source)
+        self._canceller = canceller
+
+    def start(self, callback: AudioCallback) -> None:
+        """Start source and remove echo from its audio."""
+        assert self.playback
+
+        def cancel_echo(in_data: bytes) -> None:
+            assert self.playback
+            mic = np.frombuffer(in_data, dtype=np.int16)
+            reference = np.frombuffer(self.playback.reference, dtype=np.int16)
+            callback(self._canceller.process(mic, reference).tobytes())
+
+        self._source.start(cancel_echo)
+
+
+def create_audio_source(
+    config: Config, rate: int, chunk: int, playback: Optional[Playback] = None
+) -> AudioSource:
+    """Create audio source from `audio_input` config, microphone by default.
+
+    Echo of `playback` audio is removed, as configured in `barge_in` config.
+    """
+    source_config = config.get("audio_input") or {}
+    channels = source_config.get("channels", 1)
+
+    source: AudioSource
+    if "wav" in source_config:
+        wav_config = source_config["wav"]
+        source = WavFileSource(
+            rate,
+            chunk,
+            files=wav_config["files"],
+            speed=wav_config.get("speed", 1.0),
+            loop=wav_config.get("loop", False),
+            channels=channels,
+            playback=playback,
+        )
+    else:
+        source = MicrophoneSource(rate, chunk, channels, playback)
+
+    if channels > 1:
+        source = _create_beamforming_source(source, source_config.get("beamforming") or {})
+
+    if playback:
+        echo_config = config.get("barge_in") or {}
+        filter_ms = echo_config.get("filter_ms", DEFAULT_ECHO_FILTER_MS)
+        canceller = EchoCanceller(
+            chunk,
+            num_blocks=math.ceil(filter_ms * rate / 1000 / chunk),
+            step_size=echo_config.get("step_size", DEFAULT_ECHO_STEP_SIZE),
+        )
+        source = EchoCancellingSource(source, canceller)
+
+    return source
+
+
+def _create_beamforming_source(source: AudioSource, beamforming_config: Dict) -> AudioSource:
+    """Create source combining channels of `source` as set in `beamforming_config`."""
+    channels = source.channels
+    rate = source.rate
+
+    mode = beamforming_config.get("mode", "delay_and_sum")
+    mic_channels = beamforming_config.get("mic_channels")
+
+    beamformer: Union[DelayAndSumBeamformer, ChannelSelector]
+    if mode == "delay_and_sum":
+        mics = beamforming_config.get("mics", RESPEAKER_4_MIC_POSITIONS)
+        if len(mics) != len(mic_channels or range(channels)):
+            raise ConfigValidationError("Beamforming needs position of every mic channel")
+        beamformer = DelayAndSumBeamformer(mics, rate)
+    elif mode == "select":
+        beamformer = ChannelSelector()
+    else:
+        raise ConfigValidationError(f"Unknown beamforming mode: {mode}")
+
+    return BeamformingSource(source, beamformer, mic_channels)
@@ -0,0 +1,91 @@
+"""Incremental audio encoder for speech-to-text upload."""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Generator, Iterable, List
+
+import numpy as np
+
+from voiceassistant.utils.log import get_logger
+
+_LOGGER = get_logger(__name__)
+
+DEFAULT_BLOCKSIZE = 1024  # samples, bounds buffering delay added by encoder
+
+
+@dataclass
+class EncodingReport:
+    """Encoder statistics of a single speech recognition session."""
+
+    raw_bytes: int = 0
+    encoded_bytes: int = 0
+    encode_seconds: float = 0.0
+    chunks: int = 0
+
+    @property
+    def saved_bytes(self) -> int:
+        """Get number of bytes saved on upload."""
+        return self.raw_bytes - self.encoded_bytes
+
+    @property
+    def latency(self) -> float:
+        """Get average encoding time added to each chunk in seconds."""
+        return self.encode_seconds / self.chunks if self.chunks else 0.0
+
+
+class FlacEncoder:
+    """Encode 16-bit mono audio chunks to FLAC stream on the fly.
+
+    Requires optional `pyflac` package.
+    """
+
+    def __init__(self, rate: int, blocksize: int = DEFAULT_BLOCKSIZE) -> None:
+        """Create FLAC encoder object."""
+        import pyflac  # noqa: F401, raises ImportError if not installed
+
+        self._rate = rate
+        self._blocksize = blocksize
+        self.report = EncodingReport()
+
+    def encode(self, chunks: Iterable[bytes]) -> Generator[bytes, None, None]:
+        """Generate FLAC stream from raw audio `chunks`.
+
+        Each generated chunk holds whole FLAC frames encoded so far,
+        first one is prepended with FLAC stream header.
+        """
+        import pyflac
+
+        encoded: List[bytes] = []
+        encoder = pyflac.StreamEncoder(
+            sample_rate=self._rate,
+            write_callback=lambda buffer, num_bytes, num_samples, frame: encoded.append(buffer),
+            blocksize=self._blocksize,
+        )
+        self.report = report = EncodingReport()
+
+        try:
+            for chunk in chunks:
+                start = time.perf_counter()
+                encoder.process(np.frombuffer(chunk, dtype=np.int16))
+                report.encode_seconds += time.perf_counter() - start
+                report.raw_bytes += len(chunk)
+                report.chunks += 1
+
+                if encoded:
+                    data = b"".join(encoded)
+                    encoded.clear()
+                    report.encoded_bytes += len(data)
+                    yield data
+
+            encoder.finish()
+            if encoded:
+                data = b"".join(encoded)
+                report.encoded_bytes += len(data)
+                yield data
+        finally:
+            _LOGGER.info(
+                f"FLAC upload saved {report.saved_bytes} of {report.raw_bytes} bytes, "
+                f"encoding added {report.latency * 1000:.2f} ms per chunk"
+            )
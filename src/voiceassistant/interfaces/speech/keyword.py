@@ -2,9 +2,9 @@
 
 from __future__ import annotations
 
-import struct
 from typing import TYPE_CHECKING
 
+import numpy as np
 import pvporcupine
 
 from voiceassistant.exceptions import ConfigValidationError
@@ -29,15 +29,41 @@ class KeywordDetector:
 
         self.rate = self._detector.sample_rate
         self.chunk_size = self._detector.frame_length
+        # bytes of last processed audio chunk that follow detected keyword
+        self.trailing_bytes = 0
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop samples left over from previously processed audio."""
+        self._leftover = np.empty(0, dtype=np.int16)
 
     def process(self, audio_chunk: bytes) -> int:
-        """Process audio chunk.
+        """Process audio chunk of any length frame by frame.
+
+        Samples that do not fill a whole frame are kept
+        and processed together with the next audio chunk.
 
         Returns:
             index of a recognized keyword if recognized, -1 otherwise
         """
-        pcm = struct.unpack_from("h" * self.chunk_size, audio_chunk)
-        return self._detector.process(pcm)  # type: ignore
+        pcm = np.frombuffer(audio_chunk, dtype=np.int16)
+        if self._leftover.size:
+            pcm = np.concatenate((self._leftover, pcm))
+
+        num_frames = pcm.size // self.chunk_size
+        frames = pcm[: num_frames * self.chunk_size].reshape(num_frames, self.chunk_size)
+        self._leftover = pcm[num_frames * self.chunk_size :].copy()
+
+        for index, frame in enumerate(frames):
+            # Porcupine copies any frame sequence into a C array sample by sample,
+            # which is faster from a list of Python ints than from numpy scalars
+            keyword_index: int = self._detector.process(frame.tolist())
+            if keyword_index >= 0:
+                self.trailing_bytes = (pcm.size - (index + 1) * self.chunk_size) * pcm.itemsize
+                self.reset()
+                return keyword_index
+
+        return -1
 
     def not_detected(self, audio_chunk: bytes) -> bool:
         """Determine if keyword was not detected."""
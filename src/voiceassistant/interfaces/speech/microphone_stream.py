@@ -1,14 +1,29 @@
 """Microphone audio stream implementation."""
 
-import collections
+import threading
+import time
+import weakref
+from dataclasses import dataclass, field
+from enum import Enum, auto
 from types import TracebackType
-from typing import Dict, Generator, Tuple, Type
+from typing import Any, Callable, Dict, Generator, List, Optional, Type
 
-import pyaudio
-from six.moves import queue
+from voiceassistant.interfaces.speech.audio_source import SAMPLE_WIDTH, AudioSource
+from voiceassistant.utils.datastruct import RingBuffer
+from voiceassistant.utils.log import get_logger
+from voiceassistant.utils.metrics import Histogram
+
+_LOGGER = get_logger(__name__)
 
 _PAUSED = False
 
+# audio kept in memory on top of the pre-record window, readers
+# lagging behind by more than that start losing the oldest audio
+BUFFER_SECONDS = 10
+
+# upper bounds in seconds of audio latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0)
+
 
 def pause_microphone_stream() -> None:
     """Pause microphone stream."""
@@ -28,31 +43,178 @@ def microphone_is_paused() -> bool:
     return _PAUSED
 
 
+class DropPolicy(Enum):
+    """Represent what stream does with audio it lags behind on too much."""
+
+    OLDEST = auto()  # resume from the oldest audio within allowed lag
+    LATEST = auto()  # skip the whole backlog and resume from the latest audio
+
+
+@dataclass
+class StreamStats:
+    """Statistics of all streams of the same name."""
+
+    dropped: int = 0  # bytes
+    max_lag: int = 0  # bytes
+    # how old audio is when stream hands it out, in seconds
+    latency: Histogram = field(default_factory=lambda: Histogram(LATENCY_BUCKETS))
+
+
+class AudioCaptureEngine:
+    """Long-lived audio capture into a shared ring buffer.
+
+    Audio source is opened once and kept open across utterances,
+    each utterance reads captured audio through its own `MicrophoneStream`.
+    """
+
+    def __init__(self, source: AudioSource, buffer_seconds: float) -> None:
+        """Start capturing audio from `source`."""
+        self.source = source
+        self.rate = source.rate
+        self.chunk = source.chunk
+
+        frame_size = self.chunk * SAMPLE_WIDTH
+        self.buffer = RingBuffer(int(buffer_seconds * self.rate / self.chunk) * frame_size)
+        self._streams: "weakref.WeakSet[MicrophoneStream]" = weakref.WeakSet()
+        self._stats: Dict[str, StreamStats] = {}
+        self._overflows = 0
+        self._last_write_time = time.monotonic()
+
+        self.closed = False
+        self.source.start(self._fill_buffer)
+
+    def _fill_buffer(self, in_data: bytes) -> None:
+        """Continuously collect data from the audio source into the buffer."""
+        if self.source.overflows != self._overflows:
+            self._overflows = self.source.overflows
+            _LOGGER.warning(f"Audio input overflow, {self._overflows} in total")
+
+        if not _PAUSED:
+            self.buffer.write(in_data)
+            self._last_write_time = time.monotonic()
+
+    def age(self, position: int) -> float:
+        """Estimate how long ago audio at absolute `position` was captured, in seconds.
+
+        Chunks are assumed to be delivered by source at regular intervals.
+        """
+        chunk_size = self.chunk * SAMPLE_WIDTH
+        earlier_chunks = max(self.buffer.head - position - chunk_size, 0)
+        since_write = time.monotonic() - self._last_write_time
+        return since_write + earlier_chunks / (self.rate * SAMPLE_WIDTH)
+
+    def stats(self, name: str) -> StreamStats:
+        """Get statistics of streams named `name`."""
+        return self._stats.setdefault(name, StreamStats())
+
+    def metrics(self) -> Dict:
+        """Get capture pipeline health metrics, durations in seconds."""
+        bytes_per_second = self.rate * SAMPLE_WIDTH
+        return {
+            "input_overflows": self.source.overflows,
+            "input_latency": self.source.input_latency,
+            "buffer_capacity": self.buffer.capacity / bytes_per_second,
+            "streams": {
+                name: {
+                    "open": sum(stream.name == name for stream in self.streams),
+                    "max_lag": stats.max_lag / bytes_per_second,
+                    "dropped": stats.dropped / bytes_per_second,
+                    "latency": stats.latency.as_dict(),
+                }
+                for name, stats in self._stats.items()
+            },
+        }
+
+    @property
+    def streams(self) -> List["MicrophoneStream"]:
+        """Get all open streams reading from this engine."""
+        return list(self._streams)
+
+    def stream(self, rolling_window_sec: float = 3, **kwargs: Any) -> "MicrophoneStream":
+        """Get new stream reading audio captured from now on.
+
+        Keyword arguments are passed to `MicrophoneStream`.
+        """
+        stream = MicrophoneStream(self, rolling_window_sec, **kwargs)
+        self._streams.add(stream)
+        return stream
+
+    def unregister(self, stream: "MicrophoneStream") -> None:
+        """Forget closed `stream`."""
+        self._streams.discard(stream)
+
+    def subscribe(
+        self,
+        callback: Callable[["MicrophoneStream", memoryview], None],
+        name: str,
+        drop_policy: DropPolicy = DropPolicy.LATEST,
+        max_lag_sec: Optional[float] = None,
+    ) -> "MicrophoneStream":
+        """Call `callback` with returned stream and every audio chunk it reads, in background.
+
+        Consumer stops once returned stream is closed or `callback` raises.
+        """
+        stream = self.stream(0, name=name, drop_policy=drop_policy, max_lag_sec=max_lag_sec)
+
+        def consume() -> None:
+            with stream:
+                try:
+                    for chunk in stream.generator():
+                        callback(stream, chunk)
+                except Exception:
+                    _LOGGER.exception(f"Unexpected exception in audio consumer '{name}'")
+
+        threading.Thread(target=consume, name=name, daemon=True).start()
+        return stream
+
+    def close(self) -> None:
+        """Stop capturing audio and release audio device."""
+        self.source.close()
+        self.closed = True
+        self.buffer.close()  # signal all streams to terminate
+
+
 class MicrophoneStream:
-    """Opens a recording stream as a generator yielding the audio chunks."""
+    """Opens a recording stream as a generator yielding the audio chunks.
+
+    Audio is read from the capture engine ring buffer and handed out
+    as memoryview slices of it, which stay valid until the buffer wraps
+    around, so consumers must copy data they want to keep.
 
-    def __init__(self, rate: int, chunk: int, rolling_window_sec: float = 3):
+    Any number of streams can read the same engine buffer at the same time,
+    each one keeps its own position and drop policy, lag and latency
+    statistics are shared by streams of the same name.
+    """
+
+    def __init__(
+        self,
+        engine: AudioCaptureEngine,
+        rolling_window_sec: float = 3,
+        name: str = "speech",
+        drop_policy: DropPolicy = DropPolicy.OLDEST,
+        max_lag_sec: Optional[float] = None,
+    ):
         """Create a microphone stream object."""
-        self._rate = rate
-        self._chunk = chunk
+        self.name = name
+        self._engine = engine
+        self._buff = engine.buffer
+        self._bytes_per_second = engine.rate * SAMPLE_WIDTH
 
-        # rolling window audio data buffer to store
-        # the speech pronounced before the trigger word
-        self._prerecord_buff: collections.deque = collections.deque(
-            maxlen=int(rolling_window_sec * rate / chunk)
-        )
-        self._buff: queue.Queue = queue.Queue()
-
-        audio_interface = pyaudio.PyAudio()
-        self._audio_stream = audio_interface.open(
-            format=pyaudio.paInt16,
-            channels=1,
-            rate=self._rate,
-            input=True,
-            frames_per_buffer=self._chunk,
-            stream_callback=self._fill_buffer,
-        )
-        self.closed = False
+        # rolling window of audio pronounced before the trigger word
+        frame_size = engine.chunk * SAMPLE_WIDTH
+        self._prerecord_size = int(rolling_window_sec * engine.rate / engine.chunk) * frame_size
+
+        self._drop_policy = drop_policy
+        self._max_lag = self._buff.capacity
+        if max_lag_sec is not None:
+            max_lag = int(max_lag_sec * engine.rate / engine.chunk) * frame_size
+            self._max_lag = min(max_lag, self._max_lag)
+
+        self._position = self._buff.head
+        self._closed = False
+        self._interrupted = False
+
+        self.stats = engine.stats(name)
 
     def __enter__(self):  # type: ignore
         """Start audio stream."""
@@ -62,57 +224,123 @@ class MicrophoneStream:
         self, type: Type[BaseException], value: BaseException, traceback: TracebackType
     ) -> None:
         """Stop audio stream."""
-        self._audio_stream.stop_stream()
-        self._audio_stream.close()
-        self.closed = True
-        self._buff.put(None)  # signal the generator to terminate
+        self.close()
 
-    def _fill_buffer(
-        self,
-        in_data: bytes,
-        frame_count: int,
-        time_info: Dict,
-        status_flags: int,
-    ) -> Tuple:
-        """Continuously collect data from the audio stream into the buffer."""
-        if not _PAUSED:
-            self._buff.put(in_data)
-            self._prerecord_buff.append(in_data)
-        return None, pyaudio.paContinue
+    def close(self) -> None:
+        """Stop reading audio."""
+        if self._closed:
+            return
+
+        self._closed = True
+        self._engine.unregister(self)
+        self._buff.wake()  # signal the generator to terminate
 
-    def read(self) -> bytes:
-        """Get chunk of all buffered audio bytes."""
-        data = [self._buff.get(block=True)]
+        latency = self.stats.latency
+        _LOGGER.debug(
+            f"Microphone stream '{self.name}' closed, "
+            f"max lag {self.seconds(self.stats.max_lag):.2f}s, "
+            f"dropped {self.seconds(self.stats.dropped):.2f}s, "
+            f"latency p50 {latency.percentile(50) * 1000:.0f} ms, "
+            f"p95 {latency.percentile(95) * 1000:.0f} ms"
+        )
+
+    @property
+    def closed(self) -> bool:
+        """Return True if stream or underlying capture engine is closed."""
+        return self._closed or self._buff.closed
+
+    @property
+    def position(self) -> int:
+        """Get absolute position of the next byte to be read."""
+        return self._position
+
+    def seek(self, position: int) -> None:
+        """Continue reading from absolute `position`, limited to buffered audio."""
+        self._position = min(max(position, self._buff.tail), self._buff.head)
+
+    def prerecorded(self, end: int) -> memoryview:
+        """Get rolling window of audio recorded before absolute `end` position."""
+        return self._buff.view(max(self._buff.tail, end - self._prerecord_size), end)
+
+    @property
+    def lag(self) -> int:
+        """Get number of captured bytes not yet read."""
+        return self._buff.head - self._position
+
+    def seconds(self, num_bytes: int) -> float:
+        """Convert number of audio bytes to seconds."""
+        return num_bytes / self._bytes_per_second
+
+    def read(
+        self, min_size: int = 0, max_wait: Optional[float] = None, max_size: int = 0
+    ) -> memoryview:
+        """Get chunk of all buffered audio bytes.
 
-        # Now consume whatever other data's still buffered
-        while True:
-            try:
-                data.append(self._buff.get(block=False))
-            except queue.Empty:
-                break
+        Blocks until audio is available, returns empty chunk
+        if stream is closed or reading is interrupted.
 
-        return b"".join(data)
+        Args:
+            min_size: number of bytes to wait for, to get fewer larger chunks
+            max_wait: longest time in seconds to wait for `min_size` bytes,
+                any audio buffered by then is returned
+            max_size: largest chunk to return, unlimited if 0
+        """
+        deadline = time.monotonic() + (max_wait or 0)
+        if not self._closed:
+            self._buff.wait(self._position, interrupted=self._should_stop_waiting)
+            if min_size > 1:
+                self._buff.wait(
+                    self._position + min_size - 1,
+                    timeout=None if max_wait is None else max(deadline - time.monotonic(), 0),
+                    interrupted=self._should_stop_waiting,
+                )
+        self._interrupted = False
 
-    def generator(self) -> Generator[bytes, None, None]:
-        """Continuously generate chunks of audio data."""
-        yield b"".join(self._prerecord_buff)  # pre-recorded audio chunk
-        self._prerecord_buff.clear()
+        if self.closed:
+            return self._buff.view(self._position, self._position)
 
+        head = self._buff.head
+        lag = head - self._position
+        self.stats.max_lag = max(self.stats.max_lag, lag)
+
+        if lag > self._max_lag:
+            if self._drop_policy is DropPolicy.LATEST:
+                resume_at = head
+            else:
+                resume_at = head - self._max_lag
+
+            self.stats.dropped += resume_at - self._position
+            _LOGGER.warning(
+                f"Microphone stream '{self.name}' overflow, "
+                f"dropped {self.seconds(resume_at - self._position):.2f}s"
+            )
+            self._position = resume_at
+
+        if max_size:
+            head = min(head, self._position + max_size)
+
+        if head > self._position:
+            self.stats.latency.add(self._engine.age(self._position))
+
+        start, self._position = self._position, head
+        return self._buff.view(start, head)
+
+    def generator(
+        self, min_size: int = 0, max_wait: Optional[float] = None, max_size: int = 0
+    ) -> Generator[memoryview, None, None]:
+        """Continuously generate chunks of audio data starting from current position.
+
+        Arguments are passed to `read`.
+        """
         while not self.closed:
-            chunk = self._buff.get(block=True)
-            if chunk is None:
-                return
+            chunk = self.read(min_size, max_wait, max_size)
+            if chunk:
+                yield chunk
 
-            data = [chunk]
+    def interrupt(self) -> None:
+        """Wake up pending `read` call, or make the next one return immediately."""
+        self._interrupted = True
+        self._buff.wake()
 
-            # Now consume whatever other data's still buffered.
-            while True:
-                try:
-                    chunk = self._buff.get(block=False)
-                    if chunk is None:
-                        return
-                    data.append(chunk)
-                except queue.Empty:
-                    break
-
-            yield b"".join(data)
+    def _should_stop_waiting(self) -> bool:
+        return self._interrupted or self._closed
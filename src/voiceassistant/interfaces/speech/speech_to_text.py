@@ -1,88 +1,183 @@
-"""Speech-to-text component."""
+"""Speech-to-text component.
+
+Sample config:
+
+stt:
+  backend: google_cloud  # or `vosk` for offline recognition
+  chunk_ms: 100
+  max_wait_ms: 150
+  grace_ms: 0  # keep listening that long for a chained command
+  silence_ms: 2000  # wait that long for user to start talking
+  min_silence_ms: 800  # end of speech timeout bounds, adapted to pace of transcripts
+  max_silence_ms: 4000
+  google_cloud:
+    language_code: en-US
+"""
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Generator
+import time
+from typing import TYPE_CHECKING, Generator, Iterator, Optional, Tuple
 
-import google
-from google.cloud import speech
 from iterators import TimeoutIterator
 
-from voiceassistant.exceptions import SetupIncomplete
+from voiceassistant.interfaces.speech.audio_source import SAMPLE_WIDTH
 from voiceassistant.interfaces.speech.microphone_stream import MicrophoneStream
+from voiceassistant.interfaces.speech.stt import load_backend
+from voiceassistant.interfaces.speech.vad import VoiceActivityDetector
 from voiceassistant.utils.datastruct import RecognitionString
 from voiceassistant.utils.log import get_logger
+from voiceassistant.utils.timeout import AdaptiveTimeout
 
 if TYPE_CHECKING:
     from voiceassistant.core import VoiceAssistant
 
 _LOGGER = get_logger(__name__)
 
+DEFAULT_BACKEND = "google_cloud"
+DEFAULT_CHUNK_MS = 100
+DEFAULT_MAX_WAIT_MS = 150
+DEFAULT_SILENCE_MS = 2000
+DEFAULT_MIN_SILENCE_MS = 800
+DEFAULT_MAX_SILENCE_MS = 4000
+MIN_WAIT = 0.001  # zero timeout would wait forever
+
 
 class SpeechToText:
     """Speech to Text class."""
 
-    def __init__(self, vass: VoiceAssistant, rate: int):
+    def __init__(self, vass: VoiceAssistant, rate: int, vad: VoiceActivityDetector):
         """Create speech-to-text object."""
-        config = vass.config.stt.google_cloud
+        config = vass.config.stt
+
+        # audio is sent in requests of `chunk_ms`, or shorter
+        # if it takes longer than `max_wait_ms` to record that much
+        self._chunk_size = rate * config.get("chunk_ms", DEFAULT_CHUNK_MS) // 1000
+        self._chunk_size *= SAMPLE_WIDTH
+        self._max_wait = config.get("max_wait_ms", DEFAULT_MAX_WAIT_MS) / 1000
+        self._grace = config.get("grace_ms", 0) / 1000
+        # end of speech is detected when no new transcripts arrive for a few
+        # average gaps between them, or the longest timeout if user paused
+        # in the middle of a request
+        self._silence = AdaptiveTimeout(
+            initial=config.get("silence_ms", DEFAULT_SILENCE_MS) / 1000,
+            minimum=config.get("min_silence_ms", DEFAULT_MIN_SILENCE_MS) / 1000,
+            maximum=config.get("max_silence_ms", DEFAULT_MAX_SILENCE_MS) / 1000,
+        )
+
+        self._vad = vad
+        self._backend = load_backend(config.get("backend", DEFAULT_BACKEND), vass, rate)
+        self._backend.warm_up()
+
+        # session started ahead of time: stream and its transcripts
+        self._session: Optional[Tuple[MicrophoneStream, TimeoutIterator]] = None
+        self._finishing = False
+        self._expecting_more = False
+
+    def warm_up(self) -> None:
+        """Get ready for the next recognition session."""
+        self._backend.warm_up()
+
+    def close(self) -> None:
+        """Release speech recognition backend."""
+        self._backend.close()
+
+    def prepare(self, stream: MicrophoneStream, keyword_bytes: int = 0) -> None:
+        """Start recognizing speech from `stream` in background.
+
+        Transcripts are then generated by `recognize_from_stream` called
+        with the same stream, so that session setup overlaps with whatever
+        happens in between, e.g. keyword reaction. Stream audio starts
+        with `keyword_bytes` of keyword utterance, if any.
+        """
+        self._session = (stream, self._start(stream, keyword_bytes))
+
+    def finish(self) -> None:
+        """Stop current recognition session early, nothing more is expected from user.
+
+        Session still continues if a new transcript arrives within grace window.
+        """
+        self._finishing = True
 
-        try:
-            self._client = speech.SpeechClient()
-        except google.auth.exceptions.DefaultCredentialsError as e:
-            raise SetupIncomplete(e)
+    def expect_more(self) -> None:
+        """Wait longer for the current transcript to continue, request is not complete yet."""
+        self._expecting_more = True
 
-        config = speech.RecognitionConfig(
-            encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
-            sample_rate_hertz=rate,
-            language_code=config.language_code,
+    def _start(self, stream: MicrophoneStream, keyword_bytes: int = 0) -> TimeoutIterator:
+        """Start generating transcripts from `stream` in background thread.
+
+        Each transcript is paired with time it arrived at.
+        """
+        audio = self._vad.endpoint(
+            stream.generator(self._chunk_size, self._max_wait, max_size=self._chunk_size),
+            keyword_bytes,
         )
-        self._streaming_config = speech.StreamingRecognitionConfig(
-            config=config, interim_results=True
+        transcripts = _log_first_transcript(self._backend.recognize(audio), time.monotonic())
+        self._silence.reset()
+        return TimeoutIterator(
+            ((time.monotonic(), transcript) for transcript in transcripts),
+            timeout=self._silence.value,
         )
 
     def recognize_from_stream(
         self, stream: MicrophoneStream
     ) -> Generator[RecognitionString, None, None]:
         """Generate speech transcripts from audio stream."""
-        is_final_once = False
-        initial_transcript = ""
-        transcript = "_empty_"
-
-        requests = (
-            speech.StreamingRecognizeRequest(audio_content=content)
-            for content in stream.generator()
-        )
-        responses = self._client.streaming_recognize(
-            self._streaming_config, requests, timeout=25  # type: ignore
-        )
-        responses = TimeoutIterator(responses, timeout=2)
-        timedout_response = responses.get_sentinel()  # type: ignore
-
-        for response in responses:
+        last_transcript = "_empty_"
+
+        if self._session and self._session[0] is stream:
+            transcripts = self._session[1]
+        else:
+            transcripts = self._start(stream)
+        self._session = None
+        self._finishing = False
+        self._expecting_more = False
+        in_grace_window = False
+        timedout_transcript = transcripts.get_sentinel()  # type: ignore
+
+        for item in transcripts:
             # timeout in case user is not talking
-            if response == timedout_response:
-                _LOGGER.info("Stopping speech recognition, user is not talking")
-                yield RecognitionString(transcript, is_final=True)
+            if item == timedout_transcript:
+                if in_grace_window:
+                    _LOGGER.info("Stopping speech recognition, request is complete")
+                else:
+                    _LOGGER.info("Stopping speech recognition, user is not talking")
+                stream.close()
+                yield RecognitionString(last_transcript, is_final=True)
                 return
 
-            if not response.results:
-                continue
-
-            result = response.results[0]
-            if not result.alternatives:
-                continue
+            arrival_time, transcript = item
+            self._silence.observe(arrival_time)
+            last_transcript = transcript
+            yield transcript
 
-            # best alternative
-            transcript = f"{initial_transcript} {result.alternatives[0].transcript}"
+            in_grace_window = self._finishing and not transcript.is_final
+            self._finishing = False
+            if in_grace_window and self._grace <= 0:
+                _LOGGER.info("Stopping speech recognition, request is complete")
+                stream.close()  # stops sending audio
+                return
 
-            if not result.is_final:
-                yield RecognitionString(transcript, is_final=False)
+            if in_grace_window:
+                timeout = self._grace
+            elif self._expecting_more:
+                timeout = self._silence.maximum
             else:
-                if not is_final_once:
-                    is_final_once = True
-                    initial_transcript = transcript
-                    yield RecognitionString(transcript, is_final=False)
-                else:
-                    _LOGGER.info("Stopping speech recognition, google stopped processing")
-                    yield RecognitionString(transcript, is_final=True)
-                    return
+                timeout = self._silence.value
+            self._expecting_more = False
+
+            # silence is counted from transcript arrival, not from when it is processed
+            elapsed = time.monotonic() - arrival_time
+            transcripts.set_timeout(max(timeout - elapsed, MIN_WAIT))
+
+
+def _log_first_transcript(
+    transcripts: Iterator[RecognitionString], start_time: float
+) -> Generator[RecognitionString, None, None]:
+    """Pass `transcripts` through, logging how long the first one took."""
+    for transcript in transcripts:
+        latency = time.monotonic() - start_time
+        _LOGGER.info(f"First transcript received {latency * 1000:.0f} ms after session start")
+        yield transcript
+        break
+    yield from transcripts
@@ -0,0 +1,34 @@
+"""Speech recognition backends."""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Callable
+
+from voiceassistant.exceptions import ConfigValidationError
+
+from .base import SpeechRecognizer
+
+if TYPE_CHECKING:
+    from voiceassistant.core import VoiceAssistant
+
+    SetupFuncType = Callable[[VoiceAssistant, int], SpeechRecognizer]
+
+
+_PACKAGE = "voiceassistant.interfaces.speech.stt"
+_BACKEND_MODULES = ["google_cloud", "vosk"]
+
+
+def load_backend(name: str, vass: VoiceAssistant, rate: int) -> SpeechRecognizer:
+    """Load speech recognition backend by name for audio at `rate`."""
+    if name not in _BACKEND_MODULES:
+        raise ConfigValidationError(
+            f"Unknown speech-to-text backend '{name}', available are {_BACKEND_MODULES}"
+        )
+
+    module = importlib.import_module(f".{name}", _PACKAGE)
+    setup: SetupFuncType = module.setup
+    return setup(vass, rate)
+
+
+__all__ = ["SpeechRecognizer", "load_backend"]
@@ -0,0 +1,28 @@
+"""Host base speech recognition backend class."""
+
+import abc
+from typing import Generator, Iterable
+
+from voiceassistant.utils.datastruct import RecognitionString
+
+
+class SpeechRecognizer(abc.ABC):
+    """Base speech recognition backend class."""
+
+    def warm_up(self) -> None:
+        """Prepare for the next recognition session without blocking.
+
+        E.g. connect to server, so that session starts without delay.
+        """
+
+    def close(self) -> None:
+        """Release resources kept between sessions, e.g. server connection."""
+
+    @abc.abstractmethod
+    def recognize(self, audio: Iterable[bytes]) -> Generator[RecognitionString, None, None]:
+        """Generate transcripts of 16-bit mono `audio` chunks.
+
+        Interim transcripts are generated while user is speaking,
+        the last one is final.
+        """
+        raise NotImplementedError
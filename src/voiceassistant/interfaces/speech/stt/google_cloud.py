@@ -0,0 +1,196 @@
+"""Google Cloud speech recognition backend.
+
+Sample config:
+
+stt:
+  google_cloud:
+    language_code: en-US
+    encoding: flac  # optional, requires `pyflac` package
+    record_dir: /home/pi/stt-sessions  # optional, record sessions for replay
+    endpoint: localhost:50051  # optional, use stand-in replaying recorded sessions
+    max_session_s: 60  # session is ended by silence timeout, this is a limit
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, Generator, Iterable, Optional
+
+import google
+import grpc
+from google.api_core.exceptions import DeadlineExceeded
+from google.cloud import speech
+from google.cloud.speech_v1.services.speech.transports import SpeechGrpcTransport
+
+from voiceassistant.exceptions import ConfigValidationError, SetupIncomplete
+from voiceassistant.interfaces.speech.encoder import FlacEncoder
+from voiceassistant.utils.datastruct import RecognitionString
+from voiceassistant.utils.log import get_logger
+from voiceassistant.utils.stt_replay import SessionRecorder, SessionRecording
+
+from .base import SpeechRecognizer
+
+if TYPE_CHECKING:
+    from voiceassistant.core import VoiceAssistant
+
+_LOGGER = get_logger(__name__)
+
+DEFAULT_MAX_SESSION_S = 60
+
+
+def setup(vass: VoiceAssistant, rate: int) -> SpeechRecognizer:
+    """Set up Google Cloud speech recognition."""
+    return GoogleCloudRecognizer(vass, rate)
+
+
+class GoogleCloudRecognizer(SpeechRecognizer):
+    """Streaming speech recognition with Google Cloud Speech-to-Text."""
+
+    def __init__(self, vass: VoiceAssistant, rate: int) -> None:
+        """Create Google Cloud speech recognizer."""
+        config = vass.config.stt.google_cloud
+
+        if "endpoint" in config:
+            # local stand-in server, see `voiceassistant.utils.stt_replay`
+            _LOGGER.warning(f"Using speech recognition server at {config.endpoint}")
+            channel = grpc.insecure_channel(config.endpoint)
+            self._client = speech.SpeechClient(transport=SpeechGrpcTransport(channel=channel))
+        else:
+            try:
+                self._client = speech.SpeechClient()
+            except google.auth.exceptions.DefaultCredentialsError as e:
+                raise SetupIncomplete(e)
+
+        transport = self._client.transport
+        self._channel = (
+            transport.grpc_channel if isinstance(transport, SpeechGrpcTransport) else None
+        )
+        self._keeping_connected = False
+        self._connectivity: Optional[grpc.ChannelConnectivity] = None
+        self._lock = threading.Lock()
+
+        self._encoder = _create_encoder(config.get("encoding", "linear16"), rate)
+        self._max_session = config.get("max_session_s", DEFAULT_MAX_SESSION_S)
+        self._recorder = None
+        if "record_dir" in config:
+            self._recorder = SessionRecorder(config.record_dir, rate)
+
+        config = speech.RecognitionConfig(
+            encoding=(
+                speech.RecognitionConfig.AudioEncoding.FLAC
+                if self._encoder
+                else speech.RecognitionConfig.AudioEncoding.LINEAR16
+            ),
+            sample_rate_hertz=rate,
+            language_code=config.language_code,
+        )
+        self._streaming_config = speech.StreamingRecognitionConfig(
+            config=config, interim_results=True
+        )
+
+    def warm_up(self) -> None:
+        """Connect gRPC channel in background and keep it connected from now on."""
+        with self._lock:
+            if self._channel and not self._keeping_connected:
+                self._keeping_connected = True
+                self._connectivity = None
+                self._channel.subscribe(self._keep_connected, try_to_connect=True)
+
+    def _keep_connected(self, connectivity: grpc.ChannelConnectivity) -> None:
+        """Reconnect gRPC channel once it goes idle, e.g. after idle timeout or server restart."""
+        with self._lock:
+            if not (self._channel and self._keeping_connected):
+                return
+            previous, self._connectivity = self._connectivity, connectivity
+            # state delivered on subscribing, channel is asked to connect already
+            changed = previous not in (None, connectivity)
+            if connectivity == grpc.ChannelConnectivity.IDLE and changed:
+                # subscribing is the only way to ask channel to connect without a call
+                self._channel.unsubscribe(self._keep_connected)
+                self._channel.subscribe(self._keep_connected, try_to_connect=True)
+
+    def close(self) -> None:
+        """Stop keeping gRPC channel connected."""
+        with self._lock:
+            if self._channel and self._keeping_connected:
+                self._keeping_connected = False
+                self._channel.unsubscribe(self._keep_connected)
+
+    def recognize(self, audio: Iterable[bytes]) -> Generator[RecognitionString, None, None]:
+        """Generate transcripts of `audio` streamed to Google Cloud."""
+        recording = self._recorder.start() if self._recorder else None
+        if recording:
+            audio = recording.record_audio(audio)
+        if self._encoder:
+            audio = self._encoder.encode(audio)
+
+        requests = (
+            speech.StreamingRecognizeRequest(audio_content=bytes(content)) for content in audio
+        )
+        responses = self._client.streaming_recognize(
+            self._streaming_config, requests, timeout=self._max_session  # type: ignore
+        )
+
+        try:
+            yield from self._transcribe(responses, recording)
+        finally:
+            if recording:
+                recording.save()
+
+    def _transcribe(
+        self,
+        responses: Iterable[speech.StreamingRecognizeResponse],
+        recording: Optional[SessionRecording],
+    ) -> Generator[RecognitionString, None, None]:
+        """Generate transcripts from recognition `responses`."""
+        is_final_once = False
+        initial_transcript = ""
+        transcript = "_empty_"
+
+        try:
+            for response in responses:
+                if recording:
+                    recording.add_response(speech.StreamingRecognizeResponse.serialize(response))
+
+                if not response.results:
+                    continue
+
+                result = response.results[0]
+                if not result.alternatives:
+                    continue
+
+                # best alternative
+                transcript = f"{initial_transcript} {result.alternatives[0].transcript}"
+
+                if not result.is_final:
+                    yield RecognitionString(transcript, is_final=False)
+                else:
+                    if not is_final_once:
+                        is_final_once = True
+                        initial_transcript = transcript
+                        yield RecognitionString(transcript, is_final=False)
+                    else:
+                        _LOGGER.info("Stopping speech recognition, google stopped processing")
+                        yield RecognitionString(transcript, is_final=True)
+                        return
+        except DeadlineExceeded:
+            _LOGGER.info("Stopping speech recognition, session time limit is reached")
+            yield RecognitionString(transcript, is_final=True)
+            return
+
+        _LOGGER.info("Stopping speech recognition, user stopped talking")
+        yield RecognitionString(transcript, is_final=True)
+
+
+def _create_encoder(encoding: str, rate: int) -> Optional[FlacEncoder]:
+    """Create encoder for audio upload, None for raw LINEAR16 audio."""
+    if encoding.lower() == "linear16":
+        return None
+    if encoding.lower() != "flac":
+        raise ConfigValidationError(f"Unsupported speech-to-text audio encoding: {encoding}")
+
+    try:
+        return FlacEncoder(rate)
+    except ImportError:
+        _LOGGER.warning("Package `pyflac` is not installed, uploading uncompressed audio")
+        return None
@@ -0,0 +1,90 @@
+"""Vosk offline speech recognition backend.
+
+Runs locally on CPU, requires `vosk` package and a model
+downloaded from https://alphacephei.com/vosk/models
+
+Sample config:
+
+stt:
+  backend: vosk
+  vosk:
+    model_path: /home/pi/vosk-model-small-en-us-0.15
+"""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Generator, Iterable
+
+from voiceassistant.exceptions import ConfigValidationError, SetupIncomplete
+from voiceassistant.utils.datastruct import RecognitionString
+from voiceassistant.utils.log import get_logger
+
+from .base import SpeechRecognizer
+
+if TYPE_CHECKING:
+    from voiceassistant.core import VoiceAssistant
+
+_LOGGER = get_logger(__name__)
+
+
+def setup(vass: VoiceAssistant, rate: int) -> SpeechRecognizer:
+    """Set up Vosk speech recognition."""
+    return VoskRecognizer(vass, rate)
+
+
+class VoskRecognizer(SpeechRecognizer):
+    """Offline speech recognition with Vosk (Kaldi)."""
+
+    def __init__(self, vass: VoiceAssistant, rate: int) -> None:
+        """Create Vosk speech recognizer, model is loaded once."""
+        try:
+            import vosk
+        except ImportError:
+            raise SetupIncomplete("Package `vosk` must be installed for offline speech-to-text")
+
+        config = vass.config.stt.get("vosk") or {}
+        if "model_path" not in config:
+            raise ConfigValidationError("Vosk speech-to-text requires `model_path`")
+
+        vosk.SetLogLevel(-1)
+        _LOGGER.info(f"Loading Vosk model from {config['model_path']}")
+        self._model = vosk.Model(config["model_path"])
+        self._vosk = vosk
+        self._rate = rate
+
+    def recognize(self, audio: Iterable[bytes]) -> Generator[RecognitionString, None, None]:
+        """Generate transcripts of `audio` decoded locally."""
+        recognizer = self._vosk.KaldiRecognizer(self._model, self._rate)
+        is_final_once = False
+        initial_transcript = ""
+        transcript = "_empty_"
+
+        for chunk in audio:
+            if recognizer.AcceptWaveform(bytes(chunk)):
+                # recognizer detected end of utterance
+                text = json.loads(recognizer.Result())["text"]
+                if not text:
+                    continue
+
+                transcript = f"{initial_transcript} {text}"
+                if not is_final_once:
+                    is_final_once = True
+                    initial_transcript = transcript
+                    yield RecognitionString(transcript, is_final=False)
+                else:
+                    _LOGGER.info("Stopping speech recognition, vosk stopped processing")
+                    yield RecognitionString(transcript, is_final=True)
+                    return
+            else:
+                text = json.loads(recognizer.PartialResult())["partial"]
+                if text and f"{initial_transcript} {text}" != transcript:
+                    transcript = f"{initial_transcript} {text}"
+                    yield RecognitionString(transcript, is_final=False)
+
+        text = json.loads(recognizer.FinalResult())["text"]
+        if text:
+            transcript = f"{initial_transcript} {text}"
+
+        _LOGGER.info("Stopping speech recognition, user stopped talking")
+        yield RecognitionString(transcript, is_final=True)
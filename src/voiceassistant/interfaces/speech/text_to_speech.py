@@ -1,80 +1,237 @@
-"""Text-to-speech component."""
+"""Text-to-speech component.
+
+Sample config:
+
+tts:
+  backend: polly  # or `espeak` to synthesize speech locally
+  fallback: espeak  # optional, speaks instead of backend that is late
+  deadline_ms: 700  # how long backend may take to produce audio before fallback is used
+  cache_mb: 20  # disk space for cached phrases
+  aws:
+    voice_id: Joanna
+    engine: neural  # optional, `standard` by default
+"""
 
 from __future__ import annotations
 
+import functools
 import os
-from typing import TYPE_CHECKING
-
-import boto3
-from botocore.config import Config as BotoConfig
-from botocore.exceptions import ClientError, NoCredentialsError
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import TYPE_CHECKING, Generator, Iterable, List, Optional
 
-from voiceassistant.const import DEFAULT_CONFIG_DIR
 from voiceassistant.exceptions import SetupIncomplete
+from voiceassistant.interfaces.speech.tts import SpeechSynthesizer, load_backend
+from voiceassistant.utils.cache import AudioCache
+from voiceassistant.utils.hedge import Hedge
 from voiceassistant.utils.log import get_logger
+from voiceassistant.utils.text import split_sentences
+
+from .audio_output import AudioOutput, OutputReport
 
 if TYPE_CHECKING:
     from voiceassistant.core import VoiceAssistant
 
 _LOGGER = get_logger(__name__)
 
+SAMPLE_RATE = 16000  # highest rate of Polly PCM audio
+DEFAULT_BACKEND = "polly"
+DEFAULT_DEADLINE_MS = 700
+DEFAULT_CACHE_MB = 20
+PIPELINE_WORKERS = 2
+PRESYNTHESIS_WORKERS = 2
+MAX_SENTENCE_WAIT = 0.05  # seconds, longer waits for a sentence are logged
+
 
 class TextToSpeech:
-    """Text to Speech class using Amazon Polly."""
+    """Text to Speech class using a speech synthesis backend, hedged by a fallback one.
+
+    If backend has not produced audio of a reply within deadline,
+    fallback backend is started and speech of whichever is faster is played.
+    """
+
+    def __init__(self, vass: VoiceAssistant, output: AudioOutput) -> None:
+        """Create text-to-speech object playing speech to `output`."""
+        config = vass.config.tts
+        self._output = output
+        self.backend = load_backend(config.get("backend", DEFAULT_BACKEND), vass)
+        self.fallback: Optional[SpeechSynthesizer] = None
+        if config.get("fallback"):
+            try:
+                self.fallback = load_backend(config.fallback, vass)
+            except SetupIncomplete as e:
+                _LOGGER.warning(f"Text-to-speech fallback disabled: {e}")
+        self._deadline = config.get("deadline_ms", DEFAULT_DEADLINE_MS) / 1000
+
+        cache_mb = config.get("cache_mb", DEFAULT_CACHE_MB)
+        self.cache = AudioCache(
+            os.path.join(vass.cache.directory, "tts"), size_limit=int(cache_mb * 2**20)
+        )
+
+        # synthesizes sentences ahead of playback
+        self._executor = ThreadPoolExecutor(max_workers=PIPELINE_WORKERS, thread_name_prefix="tts")
+        # fills cache with phrases before they are needed, separately
+        # so that it never holds up synthesis of speech being played
+        self._presynthesis_executor = ThreadPoolExecutor(
+            max_workers=PRESYNTHESIS_WORKERS, thread_name_prefix="tts-presynthesis"
+        )
+        self._presynthesis_jobs: List[Future] = []
+
+    def close(self) -> None:
+        """Release cache and background workers."""
+        for job in self._presynthesis_jobs:
+            job.cancel()
+        self._presynthesis_executor.shutdown(wait=False)
+        self._executor.shutdown(wait=False)
+        self.cache.close()
+
+    def presynthesize(self, phrases: Iterable[str]) -> None:
+        """Synthesize and cache `phrases` in background, unless they are cached."""
+        keys = {self._cache_key(text, self._output.rate): text for text in phrases}
+        missing = {key: text for key, text in keys.items() if key not in self.cache}
+        if not missing:
+            return
+
+        _LOGGER.info(f"Text-to-speech pre-synthesizing {len(missing)} phrases")
+        self._presynthesis_jobs = [
+            self._presynthesis_executor.submit(self._presynthesize, text, key)
+            for key, text in missing.items()
+        ]
+
+    def _presynthesize(self, text: str, key: str) -> None:
+        """Synthesize and cache `text` with backend, there is no hurry to fall back."""
+        try:
+            self.cache.set(key, self._synthesize_with_backend(text, self._output.rate))
+        except Exception as e:
+            _LOGGER.warning(f"Text-to-speech unable to pre-synthesize '{text}': {e}")
 
-    def __init__(self, vass: VoiceAssistant) -> None:
-        """Create text-to-speech object."""
-        self._config = vass.config.tts.aws
+    def say(
+        self, text: str, cache: bool = False, cancelled: Optional[threading.Event] = None
+    ) -> OutputReport:
+        """Pronounce `text`, stop once `cancelled` is set.
 
-        boto_config = BotoConfig(
-            region_name=self._config.region_name,
-            connect_timeout=0.7,
-            read_timeout=0.7,
-            parameter_validation=False,
+        Audio is played while it is being synthesized, see `speech`.
+        """
+        start_time = time.monotonic()
+        report = self._output.play(self.speech(text, cache), start_time, cancelled)
+        if report.time_to_first_sample is not None:
+            _LOGGER.info(
+                f"Text-to-speech first sample played after "
+                f"{report.time_to_first_sample * 1000:.0f} ms"
+            )
+        return report
+
+    def speech(
+        self, text: str, cache: bool = False, sample_rate: Optional[int] = None
+    ) -> Iterable[bytes]:
+        """Get 16-bit mono audio of `text` at `sample_rate`, output rate by default.
+
+        Cached audio is used if there is one, e.g. pre-synthesized.
+        Otherwise audio is generated in chunks as it is synthesized, then
+        stored in cache if `cache` is set, it is consumed completely and
+        fallback was not used.
+        """
+        sample_rate = sample_rate or self._output.rate
+        key = self._cache_key(text, sample_rate)
+        cached_audio = self.cache.get(key)
+        if cached_audio is not None:
+            return [cached_audio]
+
+        return self._pipeline(text, sample_rate, key if cache else None)
+
+    def _cache_key(self, text: str, sample_rate: int) -> str:
+        """Get cache key of `text` pronounced as configured at `sample_rate`."""
+        return AudioCache.key(text=text, sample_rate=sample_rate, **self.backend.cache_params)
+
+    def _hedge(self, text: str, sample_rate: int) -> Hedge[bytes]:
+        """Get audio of `text` from backend, or from fallback if backend is late."""
+        return Hedge(
+            functools.partial(self.backend.stream, text, sample_rate),
+            functools.partial(self.fallback.stream, text, sample_rate) if self.fallback else None,
+            self._deadline,
         )
-        self._client = boto3.Session(
-            aws_access_key_id=self._config.access_key_id,
-            aws_secret_access_key=self._config.secret_access_key,
-        ).client(service_name="polly", config=boto_config)
 
-        try:
-            self._client.describe_voices()
-        except (NoCredentialsError, ClientError):
-            raise SetupIncomplete("Amazon Polly credentials not set")
+    def _pipeline(
+        self, text: str, sample_rate: int, cache_key: Optional[str] = None
+    ) -> Generator[bytes, None, None]:
+        """Generate audio of `text` synthesized sentence by sentence.
+
+        The first sentence is streamed, the following ones are synthesized
+        in background meanwhile, so that they are ready to play in turn.
 
-    def say(self, text: str, cache: bool = False) -> None:
-        """Pronounce `text` with configured Polly voice.
+        Fallback backend speaks a sentence if backend has not produced it
+        within deadline from when it is due: the first one once requested,
+        any other one once the previous one is played. It then speaks
+        the rest of the reply, so that voice doesn't change back and forth.
 
-        ToDo:
-            Current implementation is bad and should later
-            be changed to play audio bytes directly from memory.
+        Audio is cached under `cache_key`, if given, once it is generated
+        completely and fallback backend has not spoken.
         """
-        if cache:
-            filename = text.replace(" ", "")
-
-            if not os.path.isfile(f"{DEFAULT_CONFIG_DIR}/{filename}.mp3"):
-                self.synthesize_to_mp3_file(text, filename=filename)
-                _LOGGER.info(f"Text-to-speech cached phrase: {text}")
-
-            self._play_mp3_file(filename)
-        else:
-            self.synthesize_to_mp3_file(text, filename="speech")
-            self._play_mp3_file("speech")
-            os.system(f"rm {DEFAULT_CONFIG_DIR}/speech.mp3")
-
-    def _play_mp3_file(self, filename: str) -> None:
-        """Play mp3 file."""
-        os.system(f"mpg123 {DEFAULT_CONFIG_DIR}/{filename}.mp3 >/dev/null 2>&1")
-
-    def synthesize_to_mp3_file(self, text: str, filename: str) -> None:
-        """Save synthesized `text` to mp3 file."""
-        audio_bytes = self.synthesize(text, format="mp3")
-        with open(f"{DEFAULT_CONFIG_DIR}/{filename}.mp3", "wb") as file:
-            file.write(audio_bytes)
-
-    def synthesize(self, text: str, format: str = "mp3") -> bytes:
-        """Synthesize `text` to audio bytes."""
-        return self._client.synthesize_speech(  # type: ignore
-            VoiceId=self._config.voice_id, OutputFormat=format, Text=text
-        )["AudioStream"].read()
-        # ogg_vorbis
+        first_sentence, *sentences = split_sentences(text) or [text]
+        futures = [
+            self._executor.submit(self._synthesize_with_backend, sentence, sample_rate)
+            for sentence in sentences
+        ]
+        chunks = []
+
+        try:
+            hedge = self._hedge(first_sentence, sample_rate)
+            for chunk in hedge:
+                chunks.append(chunk)
+                yield chunk
+            fallback_used = bool(hedge.used_fallback)
+
+            for sentence, future in zip(sentences, futures):
+                audio = None if fallback_used else self._wait_for_sentence(future)
+                if audio is None:
+                    assert self.fallback
+                    fallback_used = True
+                    for late_future in futures:
+                        late_future.cancel()
+                    audio = b"".join(self.fallback.stream(sentence, sample_rate))
+                chunks.append(audio)
+                yield audio
+        finally:
+            # playback stopped early
+            for future in futures:
+                future.cancel()
+
+        if cache_key and not fallback_used:
+            self.cache.set(cache_key, b"".join(chunks))
+            _LOGGER.info(f"Text-to-speech cached phrase: {text}")
+
+    def _wait_for_sentence(self, future: Future) -> Optional[bytes]:
+        """Get audio of sentence synthesized by backend in background.
+
+        Returns:
+            audio, None if backend is late or failed and there is fallback
+        """
+        wait_start = time.monotonic()
+        try:
+            audio: bytes = future.result(timeout=self._deadline if self.fallback else None)
+        except FutureTimeoutError:
+            _LOGGER.warning(
+                f"Text-to-speech sentence not ready within {self._deadline * 1000:.0f} ms "
+                f"of being due, using fallback"
+            )
+            return None
+        except Exception as e:
+            if not self.fallback:
+                raise
+            _LOGGER.warning(f"Text-to-speech failed with '{e}', using fallback")
+            return None
+
+        wait = time.monotonic() - wait_start
+        if wait > MAX_SENTENCE_WAIT:
+            _LOGGER.debug(f"Text-to-speech waited {wait * 1000:.0f} ms for a sentence")
+        return audio
+
+    def _synthesize_with_backend(self, text: str, sample_rate: int) -> bytes:
+        """Synthesize `text` with backend, without falling back."""
+        return b"".join(self.backend.stream(text, sample_rate))
+
+    def synthesize(self, text: str, sample_rate: int) -> bytes:
+        """Synthesize `text` to 16-bit mono audio at `sample_rate`."""
+        return b"".join(self._hedge(text, sample_rate))
@@ -0,0 +1,34 @@
+"""Speech synthesis backends."""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Callable
+
+from voiceassistant.exceptions import ConfigValidationError
+
+from .base import SpeechSynthesizer
+
+if TYPE_CHECKING:
+    from voiceassistant.core import VoiceAssistant
+
+    SetupFuncType = Callable[[VoiceAssistant], SpeechSynthesizer]
+
+
+_PACKAGE = "voiceassistant.interfaces.speech.tts"
+_BACKEND_MODULES = ["polly", "espeak"]
+
+
+def load_backend(name: str, vass: VoiceAssistant) -> SpeechSynthesizer:
+    """Load speech synthesis backend by name."""
+    if name not in _BACKEND_MODULES:
+        raise ConfigValidationError(
+            f"Unknown text-to-speech backend '{name}', available are {_BACKEND_MODULES}"
+        )
+
+    module = importlib.import_module(f".{name}", _PACKAGE)
+    setup: SetupFuncType = module.setup
+    return setup(vass)
+
+
+__all__ = ["SpeechSynthesizer", "load_backend"]
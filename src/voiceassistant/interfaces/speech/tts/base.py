@@ -0,0 +1,22 @@
+"""Host base speech synthesis backend class."""
+
+import abc
+from typing import Any, Dict, Generator
+
+
+class SpeechSynthesizer(abc.ABC):
+    """Base speech synthesis backend class."""
+
+    @property
+    def cache_params(self) -> Dict[str, Any]:
+        """Get parameters synthesized audio depends on besides text, e.g. voice."""
+        return {}
+
+    @abc.abstractmethod
+    def stream(self, text: str, sample_rate: int) -> Generator[bytes, None, None]:
+        """Synthesize `text`, generating 16-bit mono audio chunks at `sample_rate`.
+
+        Chunks are generated as soon as they are available,
+        so that playback starts before the whole text is synthesized.
+        """
+        raise NotImplementedError
@@ -0,0 +1,70 @@
+"""eSpeak NG local speech synthesis backend.
+
+Runs offline on CPU, requires `espeak-ng` to be installed,
+e.g. `sudo apt-get install espeak-ng`.
+
+Sample config:
+
+tts:
+  espeak:
+    voice: en-us  # optional, see `espeak-ng --voices`
+    speed: 160  # optional, words per minute
+"""
+
+from __future__ import annotations
+
+import io
+import shutil
+import subprocess
+import wave
+from typing import TYPE_CHECKING, Any, Dict, Generator
+
+from voiceassistant.exceptions import SetupIncomplete
+from voiceassistant.utils.audio import resample
+
+from .base import SpeechSynthesizer
+
+if TYPE_CHECKING:
+    from voiceassistant.core import VoiceAssistant
+
+DEFAULT_VOICE = "en-us"
+DEFAULT_SPEED = 175  # words per minute, eSpeak NG default
+
+
+def setup(vass: VoiceAssistant) -> SpeechSynthesizer:
+    """Set up eSpeak NG speech synthesis."""
+    return EspeakSynthesizer(vass)
+
+
+class EspeakSynthesizer(SpeechSynthesizer):
+    """Offline speech synthesis with eSpeak NG."""
+
+    def __init__(self, vass: VoiceAssistant) -> None:
+        """Create eSpeak NG synthesizer, raise SetupIncomplete if it is not installed."""
+        executable = shutil.which("espeak-ng")
+        if not executable:
+            raise SetupIncomplete("`espeak-ng` must be installed for local text-to-speech")
+
+        config = vass.config.tts.get("espeak") or {}
+        self._executable = executable
+        self._voice = config.get("voice", DEFAULT_VOICE)
+        self._speed = int(config.get("speed", DEFAULT_SPEED))
+
+    @property
+    def cache_params(self) -> Dict[str, Any]:
+        """Get eSpeak NG voice and speed."""
+        return {"backend": "espeak", "voice": self._voice, "speed": self._speed}
+
+    def stream(self, text: str, sample_rate: int) -> Generator[bytes, None, None]:
+        """Synthesize `text` at once, it takes a fraction of its duration."""
+        result = subprocess.run(
+            [self._executable, "--stdin", "--stdout", "-v", self._voice, "-s", str(self._speed)],
+            input=text.encode("utf-8"),
+            capture_output=True,
+            check=True,
+        )
+        with wave.open(io.BytesIO(result.stdout)) as wav:
+            rate = wav.getframerate()
+            audio = wav.readframes(wav.getnframes())
+
+        yield resample(audio, rate, sample_rate)
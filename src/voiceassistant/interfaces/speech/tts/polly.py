@@ -0,0 +1,80 @@
+"""Amazon Polly speech synthesis backend.
+
+Sample config:
+
+tts:
+  aws:
+    region_name: eu-west-2
+    access_key_id: ...
+    secret_access_key: ...
+    voice_id: Joanna
+    engine: neural  # optional, `standard` by default
+"""
+
+from __future__ import annotations
+
+from contextlib import closing
+from typing import TYPE_CHECKING, Any, Dict, Generator
+
+import boto3
+from botocore.config import Config as BotoConfig
+from botocore.exceptions import ClientError, NoCredentialsError
+
+from voiceassistant.exceptions import SetupIncomplete
+
+from .base import SpeechSynthesizer
+
+if TYPE_CHECKING:
+    from voiceassistant.core import VoiceAssistant
+
+DEFAULT_ENGINE = "standard"
+STREAM_CHUNK_SIZE = 3200  # bytes, 100 ms of PCM audio at 16 kHz
+
+
+def setup(vass: VoiceAssistant) -> SpeechSynthesizer:
+    """Set up Amazon Polly speech synthesis."""
+    return PollySynthesizer(vass)
+
+
+class PollySynthesizer(SpeechSynthesizer):
+    """Speech synthesis with Amazon Polly, audio is streamed while downloading."""
+
+    def __init__(self, vass: VoiceAssistant) -> None:
+        """Create Polly client, raise SetupIncomplete if credentials are not valid."""
+        self._config = vass.config.tts.aws
+        self._engine = self._config.get("engine", DEFAULT_ENGINE)
+
+        boto_config = BotoConfig(
+            region_name=self._config.region_name,
+            connect_timeout=0.7,
+            read_timeout=0.7,
+            parameter_validation=False,
+        )
+        self._client = boto3.Session(
+            aws_access_key_id=self._config.access_key_id,
+            aws_secret_access_key=self._config.secret_access_key,
+        ).client(service_name="polly", config=boto_config)
+
+        try:
+            self._client.describe_voices()
+        except (NoCredentialsError, ClientError):
+            raise SetupIncomplete("Amazon Polly credentials not set")
+
+    @property
+    def cache_params(self) -> Dict[str, Any]:
+        """Get Polly voice and engine."""
+        return {"voice": self._config.voice_id, "engine": self._engine, "format": "pcm"}
+
+    def stream(
+        self, text: str, sample_rate: int, chunk_size: int = STREAM_CHUNK_SIZE
+    ) -> Generator[bytes, None, None]:
+        """Synthesize `text`, generating audio in chunks as it is downloaded."""
+        response = self._client.synthesize_speech(
+            VoiceId=self._config.voice_id,
+            Engine=self._engine,
+            OutputFormat="pcm",
+            SampleRate=str(sample_rate),
+            Text=text,
+        )
+        with closing(response["AudioStream"]) as audio_stream:
+            yield from audio_stream.iter_chunks(chunk_size)
@@ -0,0 +1,192 @@
+"""Voice activity detection component.
+
+Sample config:
+
+vad:
+  silence_ms: 500
+  threshold_db: 12
+"""
+
+from __future__ import annotations
+
+import collections
+from typing import TYPE_CHECKING, Deque, Generator, Iterable, Optional
+
+import numpy as np
+
+from voiceassistant.utils.audio import energy_db, pcm16_frames, zero_crossing_rate
+from voiceassistant.utils.log import get_logger
+
+if TYPE_CHECKING:
+    from voiceassistant.core import VoiceAssistant
+
+_LOGGER = get_logger(__name__)
+
+FRAME_MS = 10  # analysis frame duration
+MIN_NOISE_FLOOR_DB = 20.0
+NOISE_FLOOR_ADAPTATION = 0.05
+
+DEFAULT_SILENCE_MS = 500
+DEFAULT_ONSET_MS = 60
+DEFAULT_PADDING_MS = 300
+DEFAULT_ONSET_GAP_MS = 700
+DEFAULT_THRESHOLD_DB = 12.0
+DEFAULT_ZCR_THRESHOLD = 0.25
+
+
+class VoiceActivityDetector:
+    """Energy and zero-crossing rate based voice activity detector."""
+
+    def __init__(self, vass: VoiceAssistant, rate: int) -> None:
+        """Create voice activity detector object."""
+        config = vass.config.get("vad") or {}
+
+        self.enabled = config.get("enabled", True)
+        self._frame_length = rate * FRAME_MS // 1000
+        self._silence_frames = config.get("silence_ms", DEFAULT_SILENCE_MS) // FRAME_MS
+        self._onset_frames = config.get("onset_ms", DEFAULT_ONSET_MS) // FRAME_MS
+        self._padding_frames = config.get("padding_ms", DEFAULT_PADDING_MS) // FRAME_MS
+        self._onset_gap_frames = config.get("onset_gap_ms", DEFAULT_ONSET_GAP_MS) // FRAME_MS
+        self._threshold_db = config.get("threshold_db", DEFAULT_THRESHOLD_DB)
+        self._zcr_threshold = config.get("zcr_threshold", DEFAULT_ZCR_THRESHOLD)
+
+        # background noise energy learned from previously processed audio
+        self._noise_floor: Optional[float] = None
+
+    def endpoint(
+        self, chunks: Iterable[memoryview], keyword_bytes: int = 0
+    ) -> Generator[memoryview, None, None]:
+        """Generate audio from `chunks` starting at speech onset until speech ends.
+
+        Silence before speech onset, except for a short padding, is dropped.
+        Generation stops once silence after speech lasts for configured time.
+        If the first `keyword_bytes` of audio end with keyword, silence counts
+        only once there is speech after them: user usually pauses after keyword.
+        """
+        if not self.enabled:
+            yield from chunks
+            return
+
+        frame_size = self._frame_length * 2
+        noise_floor = self._noise_floor
+        speech_frames = 0
+        silence_frames = 0
+        is_speaking = False
+        keyword_frames = -(-keyword_bytes // frame_size)
+        processed_frames = 0
+        # consecutive speech frames after keyword, end of speech is detected after them
+        request_frames = 0
+        request_started = not keyword_frames
+        # chunks not yet sent before speech onset
+        pending: Deque[memoryview] = collections.deque()
+        pending_frames = 0
+
+        for chunk in chunks:
+            frames = pcm16_frames(chunk, self._frame_length)
+            if not frames.size:
+                continue
+
+            energy = energy_db(frames)
+            if noise_floor is None:
+                noise_floor = _estimate_noise_floor(energy)
+            self._noise_floor = noise_floor
+
+            speech = self._is_speech(frames, energy, noise_floor)
+
+            start = 0
+            for index, is_speech in enumerate(speech):
+                if not is_speech:
+                    noise_floor = max(
+                        noise_floor + NOISE_FLOOR_ADAPTATION * (energy[index] - noise_floor),
+                        MIN_NOISE_FLOOR_DB,
+                    )
+
+                if not request_started:
+                    after_keyword = processed_frames + index >= keyword_frames
+                    request_frames = request_frames + 1 if is_speech and after_keyword else 0
+                    request_started = request_frames >= self._onset_frames
+
+                if not is_speaking:
+                    speech_frames = speech_frames + 1 if is_speech else 0
+                    if speech_frames < self._onset_frames:
+                        continue
+
+                    _LOGGER.debug("Speech onset detected")
+                    is_speaking = True
+                    onset = index + 1 - speech_frames - self._padding_frames
+                    start = max(onset, 0) * frame_size
+
+                    # padding reaches back into chunks received earlier
+                    padding = []
+                    backlog = -onset
+                    for pending_chunk in reversed(pending):
+                        if backlog <= 0:
+                            break
+                        chunk_frames = len(pending_chunk) // frame_size
+                        skip = max(chunk_frames - backlog, 0)
+                        padding.append(pending_chunk[skip * frame_size :])
+                        backlog -= chunk_frames
+                    yield from reversed(padding)
+                    pending.clear()
+                    continue
+
+                silence_frames = 0 if is_speech else silence_frames + 1
+                if request_started and silence_frames >= self._silence_frames:
+                    _LOGGER.debug("End of speech detected")
+                    yield chunk[start : (index + 1) * frame_size]
+                    return
+
+            processed_frames += len(frames)
+            if is_speaking:
+                yield chunk[start:]
+            else:
+                pending.append(chunk)
+                pending_frames += len(frames)
+                while pending and pending_frames - len(pending[0]) // frame_size >= (
+                    self._padding_frames
+                ):
+                    pending_frames -= len(pending.popleft()) // frame_size
+
+    def find_onset(self, audio: bytes) -> int:
+        """Find where the last utterance in `audio` starts.
+
+        Utterance starts after the last pause of at least `onset_gap_ms`,
+        including the usual padding before it.
+
+        Returns:
+            byte offset of utterance start in `audio`, 0 if there are no pauses
+        """
+        frames = pcm16_frames(audio, self._frame_length)
+        if not self.enabled or len(frames) < self._onset_gap_frames:
+            return 0
+
+        energy = energy_db(frames)
+        noise_floor = _estimate_noise_floor(energy)
+        if self._noise_floor is not None:
+            # window may hardly have any silence to estimate noise from
+            noise_floor = min(noise_floor, self._noise_floor)
+        silence = ~self._is_speech(frames, energy, noise_floor)
+
+        # number of silent frames in each window of gap length
+        silent_run = np.convolve(silence, np.ones(self._onset_gap_frames, dtype=int), "valid")
+        pauses = np.flatnonzero(silent_run == self._onset_gap_frames)
+        if not pauses.size:
+            return 0
+
+        # window has pauses, so noise estimated from it is reliable
+        self._noise_floor = _estimate_noise_floor(energy)
+        onset = pauses[-1] + self._onset_gap_frames - self._padding_frames
+        return max(int(onset), 0) * self._frame_length * 2
+
+    def _is_speech(self, frames: np.ndarray, energy: np.ndarray, noise_floor: float) -> np.ndarray:
+        """Classify each of `frames` as speech or not."""
+        loud = energy > noise_floor + self._threshold_db
+        # quieter frames with high zero-crossing rate are fricatives
+        fricative = energy > noise_floor + self._threshold_db / 2
+        fricative &= zero_crossing_rate(frames) > self._zcr_threshold
+        return loud | fricative  # type: ignore
+
+
+def _estimate_noise_floor(energy: np.ndarray) -> float:
+    """Estimate background noise energy from frame energies."""
+    return max(float(np.percentile(energy, 10)), MIN_NOISE_FLOOR_DB)
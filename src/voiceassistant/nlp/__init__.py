@@ -14,6 +14,9 @@ if TYPE_CHECKING:
     from voiceassistant.core import VoiceAssistant
     from voiceassistant.interfaces.base import InterfaceIO
 
+# words after an executed intent that mean user is chaining another command
+CONTINUATION_WORDS = ("and", "then", "also", "plus")
+
 
 class NaturalLanguageComponent:
     def __init__(self, vass: VoiceAssistant) -> None:
@@ -51,6 +54,8 @@ class ContinuousLanguageHandler:
         """Start natural language handler."""
         self._processed_results: List[NlpResult] = []
         self._last_text_length = 0
+        self.is_complete = False
+        self.is_pending = False
         return self
 
     def __exit__(
@@ -66,8 +71,19 @@ class ContinuousLanguageHandler:
         while user is speaking. Skill will be executed in two cases:
             1) transcript is complete (has enough information)
             2) transcript is final (user stopped speaking)
+
+        Handler becomes complete once a skill is executed and user
+        is not chaining another command, speech recognition may stop then.
+        Handler is pending while transcript matches an intent without
+        enough information yet or ends with a word chaining a command,
+        speech recognition should wait longer for user to continue then.
         """
+        full_transcript = transcript
         transcript = self._preprocess_transcript(transcript)
+        if transcript.strip():
+            # user said something not processed yet
+            self.is_complete = False
+        self.is_pending = _is_continued(full_transcript)
 
         for nlp_processor in self._processors:
             nlp_result = nlp_processor.process(transcript)
@@ -85,6 +101,11 @@ class ContinuousLanguageHandler:
                     entities=nlp_result.entities,
                     interface=self._interface,
                 )
+                self.is_complete = not _is_continued(full_transcript)
+                self.is_pending = not self.is_complete
+            else:
+                # intent is recognized, but user is still saying its details
+                self.is_pending = True
 
     def _preprocess_transcript(self, text: RecognitionString) -> RecognitionString:
         """Remove part of transcript that was already processed."""
@@ -97,7 +118,13 @@ class ContinuousLanguageHandler:
     def _make_record(self, transcript: RecognitionString, nlp_result: NlpResult) -> None:
         """Make record of a processed transcript."""
         self._processed_results.append(nlp_result)
-        self._last_text_length = len(transcript)
+        self._last_text_length += len(transcript)
+
+
+def _is_continued(transcript: str) -> bool:
+    """Return True if `transcript` ends with a word chaining another command."""
+    words = transcript.lower().split()
+    return bool(words) and words[-1] in CONTINUATION_WORDS
 
 
 __all__ = ["NaturalLanguageHandler"]
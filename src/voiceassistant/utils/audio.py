@@ -0,0 +1,181 @@
+"""Host audio signal processing utils."""
+
+from typing import Optional
+
+import numpy as np
+
+
+def pcm16_frames(audio: bytes, frame_length: int) -> np.ndarray:
+    """Get zero-copy 2D view of 16-bit PCM `audio` split into frames.
+
+    Samples that do not fill a whole frame are left out.
+    """
+    pcm = np.frombuffer(audio, dtype=np.int16)
+    num_frames = pcm.size // frame_length
+    return pcm[: num_frames * frame_length].reshape(num_frames, frame_length)
+
+
+def energy_db(frames: np.ndarray) -> np.ndarray:
+    """Get energy of each frame in decibels."""
+    samples = frames.astype(np.float32)
+    return 10 * np.log10(np.mean(samples * samples, axis=-1) + 1.0)  # type: ignore
+
+
+def zero_crossing_rate(frames: np.ndarray) -> np.ndarray:
+    """Get rate of sign changes between consecutive samples of each frame."""
+    return np.mean(np.diff(np.signbit(frames), axis=-1), axis=-1)  # type: ignore
+
+
+def deinterleave(audio: bytes, channels: int) -> np.ndarray:
+    """Get zero-copy view of interleaved 16-bit PCM `audio` with one row per channel."""
+    pcm = np.frombuffer(audio, dtype=np.int16)
+    return pcm[: pcm.size - pcm.size % channels].reshape(-1, channels).T
+
+
+def to_pcm16(signal: np.ndarray) -> np.ndarray:
+    """Round and clip float `signal` to 16-bit PCM samples."""
+    return np.clip(np.rint(signal), -32768, 32767).astype(np.int16)  # type: ignore
+
+
+def resample(audio: bytes, from_rate: int, to_rate: int) -> bytes:
+    """Resample 16-bit PCM `audio` by linear interpolation between samples."""
+    if from_rate == to_rate:
+        return audio
+
+    pcm = np.frombuffer(audio, dtype=np.int16)
+    num_samples = round(pcm.size * to_rate / from_rate)
+    times = np.arange(num_samples) * from_rate / to_rate
+    return to_pcm16(np.interp(times, np.arange(pcm.size), pcm)).tobytes()
+
+
+class DelayAndSumBeamformer:
+    """Steer microphone array to the loudest direction in horizontal plane.
+
+    Each chunk is transformed to frequency domain, channels are aligned
+    with phase shifts for every candidate direction at once and summed.
+    Direction with the highest smoothed power in speech band is output.
+    Delays between channels of a small array are a few samples, so
+    circular shifts within a chunk leave hardly audible artifacts.
+    """
+
+    SPEED_OF_SOUND = 343.0  # m/s
+    SPEECH_BAND = (300.0, 3400.0)  # Hz
+
+    def __init__(
+        self,
+        mic_positions: np.ndarray,
+        rate: int,
+        num_directions: int = 36,
+        smoothing: float = 0.9,
+    ) -> None:
+        """Create beamformer for mics at (x, y) `mic_positions` in metres."""
+        self._positions = np.asarray(mic_positions, dtype=np.float64)
+        self._rate = rate
+        self._smoothing = smoothing
+        self.directions = np.linspace(0, 360, num_directions, endpoint=False)
+
+        angles = np.radians(self.directions)
+        units = np.stack([np.cos(angles), np.sin(angles)], axis=1)
+        # plane wave from each direction reaches mics closer to the source earlier
+        self._delays = -(units @ self._positions.T) / self.SPEED_OF_SOUND  # (directions, mics)
+
+        self._num_samples = 0
+        self._power = np.zeros(num_directions)
+
+    def _prepare(self, num_samples: int) -> None:
+        """Compute steering vectors for chunks of `num_samples`."""
+        self._num_samples = num_samples
+        frequencies = np.fft.rfftfreq(num_samples, 1 / self._rate)
+        self._steering = np.exp(2j * np.pi * self._delays[..., None] * frequencies)
+        low, high = self.SPEECH_BAND
+        self._band = (frequencies >= low) & (frequencies <= high)
+
+    @property
+    def direction(self) -> float:
+        """Get currently selected direction in degrees."""
+        return float(self.directions[np.argmax(self._power)])
+
+    def process(self, signals: np.ndarray) -> np.ndarray:
+        """Get mono 16-bit PCM from `signals` with one row per mic."""
+        if signals.shape[1] != self._num_samples:
+            self._prepare(signals.shape[1])
+
+        spectra = np.fft.rfft(signals, axis=1)
+        steered = np.einsum("dmf,mf->df", self._steering, spectra) / len(self._positions)
+
+        power = np.sum(np.abs(steered[:, self._band]) ** 2, axis=1)
+        self._power = self._smoothing * self._power + (1 - self._smoothing) * power
+
+        best = np.argmax(self._power)
+        return to_pcm16(np.fft.irfft(steered[best], n=self._num_samples))
+
+
+class ChannelSelector:
+    """Pick microphone with the highest smoothed energy."""
+
+    def __init__(self, smoothing: float = 0.9) -> None:
+        """Create channel selector."""
+        self._smoothing = smoothing
+        self._energy: Optional[np.ndarray] = None
+
+    def process(self, signals: np.ndarray) -> np.ndarray:
+        """Get 16-bit PCM of the loudest channel of `signals` with one row per mic."""
+        samples = signals.astype(np.float32)
+        energy = np.mean(samples * samples, axis=1)
+        if self._energy is not None:
+            energy = self._smoothing * self._energy + (1 - self._smoothing) * energy
+        self._energy = energy
+        return np.ascontiguousarray(signals[np.argmax(energy)])
+
+
+class EchoCanceller:
+    """Partitioned block frequency domain NLMS adaptive echo canceller.
+
+    Adaptive filter models echo path from `reference` audio being played
+    to `mic` audio recorded in sync with it, estimated echo is subtracted
+    from recorded audio. Filter spans `num_blocks` blocks, enough to cover
+    room reverberation and playback to recording latency.
+    """
+
+    def __init__(
+        self, block_size: int, num_blocks: int, step_size: float = 0.5, smoothing: float = 0.9
+    ) -> None:
+        """Create echo canceller for blocks of `block_size` samples."""
+        self._block_size = block_size
+        self._step_size = step_size
+        self._smoothing = smoothing
+
+        num_bins = block_size + 1
+        self._weights = np.zeros((num_blocks, num_bins), dtype=np.complex128)
+        # spectra of the latest reference blocks, newest first
+        self._spectra = np.zeros((num_blocks, num_bins), dtype=np.complex128)
+        self._power = np.zeros(num_bins)
+        self._previous = np.zeros(block_size)
+
+    def process(self, mic: np.ndarray, reference: np.ndarray) -> np.ndarray:
+        """Get 16-bit PCM `mic` block with echo of `reference` block removed."""
+        size = self._block_size
+        samples = reference.astype(np.float64)
+
+        self._spectra = np.roll(self._spectra, 1, axis=0)
+        self._spectra[0] = np.fft.rfft(np.concatenate([self._previous, samples]))
+        self._previous = samples
+        if not self._spectra.any():
+            # nothing played recently, no echo to cancel
+            return mic
+
+        echo = np.fft.irfft(np.sum(self._weights * self._spectra, axis=0))[size:]
+        error = mic - echo
+
+        power = np.abs(self._spectra[0]) ** 2
+        self._power = self._smoothing * self._power + (1 - self._smoothing) * power
+        normalization = len(self._weights) * self._power + 1e-3 * np.max(self._power) + 1.0
+
+        error_spectrum = np.fft.rfft(np.concatenate([np.zeros(size), error]))
+        gradient = np.conj(self._spectra) * error_spectrum / normalization
+        # keep filter causal, second half of each partition must stay zero
+        constrained = np.fft.irfft(gradient, axis=1)
+        constrained[:, size:] = 0
+        self._weights += self._step_size * np.fft.rfft(constrained, axis=1)
+
+        return to_pcm16(error)
@@ -0,0 +1,65 @@
+"""Cache utils."""
+
+import hashlib
+import json
+import threading
+from typing import Any, Dict, Optional
+
+import diskcache as dc
+
+
+class AudioCache:
+    """Disk cache of audio with a size budget, least recently used audio is evicted.
+
+    Audio is keyed by a hash of all parameters it was produced with,
+    so that a change of any of them is a cache miss.
+    """
+
+    def __init__(self, directory: str, size_limit: int) -> None:
+        """Create cache in `directory` holding up to `size_limit` bytes of audio."""
+        self._cache = dc.Cache(
+            directory, size_limit=size_limit, eviction_policy="least-recently-used"
+        )
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(**params: Any) -> str:
+        """Get cache key of audio produced with `params`."""
+        serialized = json.dumps(params, sort_keys=True).encode("utf-8")
+        return hashlib.sha256(serialized).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Get cached audio, None if it is not cached."""
+        audio = self._cache.get(key)
+        with self._lock:
+            if audio is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return audio  # type: ignore
+
+    def __contains__(self, key: str) -> bool:
+        """Return True if audio is cached, without counting a hit or a miss."""
+        return key in self._cache
+
+    def set(self, key: str, audio: bytes) -> None:
+        """Cache `audio`, evicting least recently used audio beyond size limit."""
+        self._cache.set(key, audio)
+        # culling on set stops after a few entries, even if size limit is still exceeded
+        self._cache.cull()
+
+    def stats(self) -> Dict:
+        """Get cache hit and miss counts and size."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._cache),
+            "bytes": self._cache.volume(),
+            "size_limit": self._cache.size_limit,
+        }
+
+    def close(self) -> None:
+        """Close cache files."""
+        self._cache.close()
@@ -1,6 +1,7 @@
 """Host custom data structures used in the project."""
 
-from typing import Any
+import threading
+from typing import Any, Callable, Optional
 
 from voiceassistant.exceptions import DottedAttribureError
 
@@ -44,3 +45,109 @@ class RecognitionString(str):
         self_obj = str.__new__(cls, value)
         self_obj.is_final = is_final
         return self_obj
+
+
+class RingBuffer:
+    """Preallocated bounded byte ring buffer with zero-copy reads.
+
+    Every write is mirrored into the second half of the underlying
+    bytearray, so that any window of up to `capacity` bytes is contiguous
+    and can be handed out as a memoryview without copying.
+
+    Positions are absolute byte counters. When the writer laps a reader,
+    the oldest bytes are overwritten: a reader that is more than `capacity`
+    bytes behind can only resume from `tail`, the oldest byte still stored.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """Create ring buffer of `capacity` bytes."""
+        if capacity <= 0:
+            raise ValueError("Ring buffer capacity must be positive")
+
+        self.capacity = capacity
+        self._data = bytearray(2 * capacity)
+        self._view = memoryview(self._data)
+        self._head = 0
+        self._condition = threading.Condition()
+        self.closed = False
+
+    @property
+    def head(self) -> int:
+        """Return absolute position of the next byte to be written."""
+        return self._head
+
+    @property
+    def tail(self) -> int:
+        """Return absolute position of the oldest byte still available."""
+        return max(0, self._head - self.capacity)
+
+    def write(self, data: bytes) -> None:
+        """Write `data` overwriting the oldest bytes if buffer is full."""
+        size = len(data)
+        if not size:
+            return
+
+        if size > self.capacity:
+            skipped = size - self.capacity
+            data = memoryview(data)[skipped:]
+            size = self.capacity
+        else:
+            skipped = 0
+
+        offset = (self._head + skipped) % self.capacity
+        split = self.capacity - offset
+        self._view[offset : offset + size] = data
+
+        if size <= split:
+            self._view[offset + self.capacity : offset + self.capacity + size] = data
+        else:
+            self._view[offset + self.capacity :] = memoryview(data)[:split]
+            self._view[: size - split] = memoryview(data)[split:]
+
+        with self._condition:
+            self._head += skipped + size
+            self._condition.notify_all()
+
+    def view(self, start: int, end: int) -> memoryview:
+        """Get zero-copy view of bytes between absolute `start` and `end` positions."""
+        if not 0 <= end - start <= self.capacity or end > self._head:
+            raise IndexError(f"Range [{start}, {end}) is not available in ring buffer")
+
+        offset = start % self.capacity
+        return self._view[offset : offset + end - start]
+
+    def wait(
+        self,
+        position: int,
+        timeout: Optional[float] = None,
+        interrupted: Optional[Callable[[], bool]] = None,
+    ) -> bool:
+        """Block until there are bytes written after `position`.
+
+        Waiting also ends once `interrupted` returns True,
+        it is checked on start and on every `wake` call.
+
+        Returns:
+            True if new bytes are available, False on timeout,
+            interruption or if buffer is closed
+        """
+
+        def ready() -> bool:
+            if self._head > position or self.closed:
+                return True
+            return bool(interrupted and interrupted())
+
+        with self._condition:
+            self._condition.wait_for(ready, timeout=timeout)
+            return self._head > position
+
+    def wake(self) -> None:
+        """Wake up all waiting readers to re-check their interruption condition."""
+        with self._condition:
+            self._condition.notify_all()
+
+    def close(self) -> None:
+        """Close buffer and wake up all waiting readers."""
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
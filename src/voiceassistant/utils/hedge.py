@@ -0,0 +1,121 @@
+"""Host hedged request utils."""
+
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Callable, Generic, Iterable, Iterator, List, Optional, TypeVar
+
+from voiceassistant.utils.log import get_logger
+
+_LOGGER = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class _Start(Generic[T]):
+    """First result of a source: its first item, or why there is none."""
+
+    is_fallback: bool
+    items: Optional[Iterator[T]] = None
+    first: Optional[T] = None
+    empty: bool = False
+    error: Optional[Exception] = None
+
+
+class Hedge(Generic[T]):
+    """Items of primary source, or of fallback source if primary is late.
+
+    Fallback source is started if primary has not produced its first item
+    within `deadline` seconds, or has failed. Items then come from the source
+    that produces first, the other one is discarded.
+    """
+
+    def __init__(
+        self,
+        primary: Callable[[], Iterable[T]],
+        fallback: Optional[Callable[[], Iterable[T]]],
+        deadline: float,
+    ) -> None:
+        """Create hedge of `primary` and `fallback` source factories."""
+        self._primary = primary
+        self._fallback = fallback
+        self._deadline = deadline
+        self._starts: "queue.Queue[_Start[T]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._decided = False
+        self.used_fallback: Optional[bool] = None  # None until decided
+
+    def __iter__(self) -> Iterator[T]:
+        """Generate items of the faster source."""
+        if not self._fallback:
+            self.used_fallback = False
+            yield from self._primary()
+            return
+
+        self._start(self._primary, is_fallback=False)
+        errors: List[Exception] = []
+        start: Optional[_Start[T]]
+        try:
+            start = self._starts.get(timeout=self._deadline)
+        except queue.Empty:
+            _LOGGER.warning(f"No result within {self._deadline * 1000:.0f} ms, using fallback")
+            start = None
+
+        if start is None or start.error:
+            if start and start.error:
+                _LOGGER.warning(f"Failed with '{start.error}', using fallback")
+                errors.append(start.error)
+            self._start(self._fallback, is_fallback=True)
+            start = self._first_success(errors, sources=2)
+
+        self._decide(start)
+        if not start.empty:
+            yield start.first  # type: ignore
+            yield from start.items  # type: ignore
+
+    def _first_success(self, errors: List[Exception], sources: int) -> _Start[T]:
+        """Wait for first source to produce, raise error of first failed one if all fail."""
+        while True:
+            start = self._starts.get()
+            if not start.error:
+                return start
+            errors.append(start.error)
+            if len(errors) == sources:
+                raise errors[0]
+
+    def _start(self, factory: Callable[[], Iterable[T]], is_fallback: bool) -> None:
+        """Get first item of source in background thread."""
+
+        def run() -> None:
+            items = None
+            try:
+                items = iter(factory())
+                start = _Start(is_fallback, items, next(items))
+            except StopIteration:
+                start = _Start(is_fallback, items, empty=True)
+            except Exception as e:
+                start = _Start(is_fallback, error=e)
+
+            with self._lock:
+                if not self._decided:
+                    self._starts.put(start)
+                    return
+            _discard(start)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def _decide(self, winner: _Start[T]) -> None:
+        """Use `winner` source, discard the other one if it has started already."""
+        with self._lock:
+            self._decided = True
+            self.used_fallback = winner.is_fallback
+            while not self._starts.empty():
+                _discard(self._starts.get())
+
+
+def _discard(start: _Start) -> None:
+    """Stop source that lost the race."""
+    close = getattr(start.items, "close", None)
+    if close:
+        close()
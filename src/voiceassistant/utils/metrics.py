@@ -0,0 +1,55 @@
+"""Host runtime metrics utils."""
+
+import bisect
+import threading
+from typing import Dict, List, Sequence
+
+
+class Histogram:
+    """Thread-safe histogram of values counted in buckets with fixed upper bounds."""
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        """Create histogram with buckets of ascending upper `bounds`."""
+        self.bounds = list(bounds)
+        # the last bucket counts values above all bounds
+        self.counts: List[int] = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, value: float) -> None:
+        """Count `value`."""
+        with self._lock:
+            self.counts[bisect.bisect_left(self.bounds, value)] += 1
+            self.count += 1
+            self.total += value
+            self.max = max(self.max, value)
+
+    def percentile(self, percent: float) -> float:
+        """Get upper bound of the bucket holding given `percent` of values.
+
+        Maximum value is returned for values above all bounds.
+        """
+        rank = percent / 100 * self.count
+        accumulated = 0
+        for bound, count in zip(self.bounds, self.counts):
+            accumulated += count
+            if accumulated and accumulated >= rank:
+                return bound
+        return self.max
+
+    def as_dict(self) -> Dict:
+        """Get histogram summary and bucket counts."""
+        with self._lock:
+            buckets = {f"le_{bound:g}": count for bound, count in zip(self.bounds, self.counts)}
+            buckets["le_inf"] = self.counts[-1]
+            return {
+                "count": self.count,
+                "mean": self.total / self.count if self.count else 0.0,
+                "max": self.max,
+                "p50": self.percentile(50),
+                "p95": self.percentile(95),
+                "p99": self.percentile(99),
+                "buckets": buckets,
+            }
@@ -0,0 +1,152 @@
+"""Host job scheduling utils."""
+
+import itertools
+import threading
+from enum import IntEnum
+from typing import Callable, Hashable, List, Optional
+
+from voiceassistant.utils.log import get_logger
+
+_LOGGER = get_logger(__name__)
+
+JobFunc = Callable[[threading.Event], None]
+
+
+class Priority(IntEnum):
+    """Represent job priority, lower value runs first."""
+
+    HIGH = 0  # e.g. errors, replies to keyword
+    NORMAL = 1
+    LOW = 2
+
+
+class Job:
+    """Job submitted to scheduler.
+
+    Job function is called with event that is set once job is cancelled.
+    """
+
+    def __init__(self, key: Hashable, func: JobFunc, priority: Priority, order: int) -> None:
+        """Create job."""
+        self.key = key
+        self.priority = priority
+        self._func = func
+        self._order = order
+        self.cancelled = threading.Event()
+        self.done = threading.Event()
+        self.running = False
+        self._interrupt: Optional[Callable[[], None]] = None
+
+    @property
+    def sort_key(self) -> tuple:
+        """Get key to order jobs by priority, then by time of submission."""
+        return (self.priority, self._order)
+
+    def run(self, interrupt: Optional[Callable[[], None]]) -> None:
+        """Run job function, `interrupt` is called if job is cancelled meanwhile."""
+        self.running = True
+        self._interrupt = interrupt
+        try:
+            if not self.cancelled.is_set():
+                self._func(self.cancelled)
+        finally:
+            self.running = False
+            self._interrupt = None
+            self.done.set()
+
+    def cancel(self) -> None:
+        """Cancel job, interrupting it if it is running."""
+        self.cancelled.set()
+        interrupt = self._interrupt
+        if interrupt:
+            interrupt()
+        elif not self.running:
+            # dropped once its turn comes
+            self.done.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait until job is done or dropped, return False on timeout."""
+        return self.done.wait(timeout)
+
+
+class SerialScheduler:
+    """Run jobs one at a time in a background thread.
+
+    Jobs of higher priority run first, jobs of the same priority run
+    in order of submission. A job with the same key as one already waiting
+    is merged into it.
+    """
+
+    def __init__(self, name: str, interrupt: Optional[Callable[[], None]] = None) -> None:
+        """Create scheduler, `interrupt` stops a running job once it's cancelled."""
+        self._name = name
+        self._interrupt = interrupt
+        self._queue: List[Job] = []
+        self._order = itertools.count()
+        self._current: Optional[Job] = None
+        self._closed = False
+        self._condition = threading.Condition()
+        threading.Thread(target=self._run, name=name, daemon=True).start()
+
+    def submit(self, key: Hashable, func: JobFunc, priority: Priority = Priority.NORMAL) -> Job:
+        """Add job to queue without waiting for it to run."""
+        with self._condition:
+            for job in self._queue:
+                if job.key == key and not job.cancelled.is_set():
+                    job.priority = min(job.priority, priority)
+                    return job
+
+            job = Job(key, func, priority, next(self._order))
+            self._queue.append(job)
+            self._condition.notify()
+            return job
+
+    @property
+    def pending(self) -> int:
+        """Get number of jobs waiting to run."""
+        return sum(not job.cancelled.is_set() for job in self._queue)
+
+    def cancel_all(self) -> None:
+        """Cancel waiting and running jobs."""
+        with self._condition:
+            jobs = self._queue
+            self._queue = []
+            current = self._current
+
+        for job in jobs:
+            job.cancel()
+            job.done.set()
+        if current:
+            current.cancel()
+
+    def close(self) -> None:
+        """Cancel all jobs and stop background thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self.cancel_all()
+
+    def _next_job(self) -> Optional[Job]:
+        """Wait for a job of the highest priority, None once closed."""
+        with self._condition:
+            self._current = None
+            self._condition.wait_for(lambda: self._queue or self._closed)
+            if self._closed:
+                return None
+
+            job = min(self._queue, key=lambda job: job.sort_key)
+            self._queue.remove(job)
+            self._current = job
+            return job
+
+    def _run(self) -> None:
+        """Run jobs until closed."""
+        while True:
+            job = self._next_job()
+            if not job:
+                return
+
+            try:
+                job.run(self._interrupt)
+            except Exception:
+                _LOGGER.exception(f"Unexpected exception raised in {self._name} job")
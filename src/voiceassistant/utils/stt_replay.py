@@ -0,0 +1,184 @@
+"""Record and replay streaming speech recognition sessions.
+
+Each recorded session is stored as a pair of files: WAV with audio
+sent for recognition and JSON with timing of audio chunks and serialized
+responses. Stand-in gRPC server replays recorded responses to clients
+of Google Cloud Speech-to-Text API with the original timing, so that
+speech processing can be benchmarked offline and deterministically.
+
+Run stand-in server:
+
+vass-stt-replay --port 50051 ~/.cache/voiceassistant/stt-sessions
+"""
+
+import argparse
+import base64
+import glob
+import json
+import os
+import threading
+import time
+import wave
+from concurrent import futures
+from datetime import datetime
+from typing import Any, Dict, Generator, Iterable, Iterator, List, Optional
+
+import grpc
+
+from voiceassistant.utils.log import get_logger
+
+_LOGGER = get_logger(__name__)
+
+STREAMING_RECOGNIZE = "/google.cloud.speech.v1.Speech/StreamingRecognize"
+DEFAULT_PORT = 50051
+
+
+class SessionRecording:
+    """Audio and responses of a single recognition session being recorded."""
+
+    def __init__(self, path: str, rate: int) -> None:
+        """Create recording to be saved to `path` without extension."""
+        self.path = path
+        self._rate = rate
+        self._start_time = time.monotonic()
+        self._audio: List[bytes] = []
+        self._requests: List[Dict] = []
+        self._responses: List[Dict] = []
+
+    def _elapsed(self) -> float:
+        return time.monotonic() - self._start_time
+
+    def record_audio(self, chunks: Iterable[bytes]) -> Generator[bytes, None, None]:
+        """Pass 16-bit mono audio `chunks` through, recording each of them."""
+        for chunk in chunks:
+            self._audio.append(bytes(chunk))
+            self._requests.append({"time": self._elapsed(), "size": len(chunk)})
+            yield chunk
+
+    def add_response(self, data: bytes) -> None:
+        """Record serialized response message."""
+        self._responses.append(
+            {"time": self._elapsed(), "data": base64.b64encode(data).decode("ascii")}
+        )
+
+    def save(self) -> None:
+        """Write recording to WAV and JSON files."""
+        with wave.open(f"{self.path}.wav", "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(self._rate)
+            wav.writeframes(b"".join(self._audio))
+
+        with open(f"{self.path}.json", "w") as file:
+            json.dump(
+                {"rate": self._rate, "requests": self._requests, "responses": self._responses},
+                file,
+            )
+        _LOGGER.info(f"Speech recognition session recorded to {self.path}.json")
+
+
+class SessionRecorder:
+    """Create recordings of recognition sessions in a directory."""
+
+    def __init__(self, directory: str, rate: int) -> None:
+        """Create recorder saving sessions of audio at `rate` to `directory`."""
+        os.makedirs(directory, exist_ok=True)
+        self._directory = directory
+        self._rate = rate
+
+    def start(self) -> SessionRecording:
+        """Start recording a new session."""
+        name = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        return SessionRecording(os.path.join(self._directory, name), self._rate)
+
+
+def load_recordings(paths: Iterable[str]) -> List[Dict]:
+    """Load recorded sessions from JSON files or directories with them, sorted by name."""
+    files: List[str] = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, "*.json"))))
+        else:
+            files.append(path)
+
+    recordings = []
+    for filename in files:
+        with open(filename) as file:
+            recordings.append(json.load(file))
+    return recordings
+
+
+class ReplayHandler(grpc.GenericRpcHandler):  # type: ignore[misc]
+    """Replay recorded responses to streaming recognition calls, one session per call.
+
+    Messages are not parsed, so Google Cloud client libraries are not needed.
+    """
+
+    def __init__(self, recordings: List[Dict]) -> None:
+        """Create handler replaying `recordings` in order, over and over."""
+        if not recordings:
+            raise ValueError("No speech recognition sessions to replay")
+
+        self._recordings = recordings
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def service(self, handler_call_details: grpc.HandlerCallDetails) -> Optional[Any]:
+        """Get handler for streaming recognition method."""
+        if handler_call_details.method != STREAMING_RECOGNIZE:
+            return None
+        return grpc.stream_stream_rpc_method_handler(self._streaming_recognize)
+
+    def _streaming_recognize(
+        self, requests: Iterator[bytes], context: grpc.ServicerContext
+    ) -> Generator[bytes, None, None]:
+        """Send responses of the next recording timed from the first request."""
+        with self._lock:
+            recording = self._recordings[self._next % len(self._recordings)]
+            self._next += 1
+
+        first_request = threading.Event()
+
+        def consume_requests() -> None:
+            for _ in requests:
+                first_request.set()
+            first_request.set()
+
+        threading.Thread(target=consume_requests, daemon=True).start()
+        first_request.wait()
+        start_time = time.monotonic()
+        # responses are timed relative to the first request, not session start
+        offset = recording["requests"][0]["time"] if recording["requests"] else 0.0
+
+        for response in recording["responses"]:
+            delay = response["time"] - offset
+            time.sleep(max(start_time + delay - time.monotonic(), 0))
+            if not context.is_active():
+                return
+            yield base64.b64decode(response["data"])
+
+
+def serve(recordings: List[Dict], port: int = DEFAULT_PORT) -> grpc.Server:
+    """Start stand-in speech recognition server on localhost `port`."""
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+    server.add_generic_rpc_handlers((ReplayHandler(recordings),))
+    server.add_insecure_port(f"localhost:{port}")
+    server.start()
+    return server
+
+
+def main() -> None:
+    """Run stand-in speech recognition server."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("recordings", nargs="+", help="Session JSON files or directories")
+    parser.add_argument("-p", "--port", type=int, default=DEFAULT_PORT, help="Server port")
+    args = parser.parse_args()
+
+    recordings = load_recordings(args.recordings)
+    server = serve(recordings, args.port)
+    _LOGGER.info(f"Replaying {len(recordings)} speech recognition sessions on port {args.port}")
+    server.wait_for_termination()
+
+
+if __name__ == "__main__":
+    main()
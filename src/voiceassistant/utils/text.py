@@ -0,0 +1,12 @@
+"""Text processing utils."""
+
+import re
+from typing import List
+
+# end of sentence punctuation followed by whitespace, e.g. not a decimal point
+_SENTENCE_END_REGEX = re.compile(r"(?<=[.!?;])\s+")
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split `text` into sentences, keeping their punctuation."""
+    return [sentence for sentence in _SENTENCE_END_REGEX.split(text.strip()) if sentence]
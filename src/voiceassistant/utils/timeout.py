@@ -0,0 +1,56 @@
+"""Adaptive timeout utils."""
+
+from typing import Optional
+
+
+class AdaptiveTimeout:
+    """Timeout adapting to observed gaps between events.
+
+    Timeout is a multiple of exponential moving average of gaps,
+    kept within bounds, so that it ends sooner for a fast-paced sequence
+    of events and later for a slow one.
+    """
+
+    def __init__(
+        self,
+        initial: float,
+        minimum: float,
+        maximum: float,
+        factor: float = 3.0,
+        smoothing: float = 0.3,
+    ) -> None:
+        """Create timeout, `initial` until first gap is observed."""
+        self._initial = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self._factor = factor
+        self._smoothing = smoothing
+        self._average: Optional[float] = None
+        self._last_time: Optional[float] = None
+
+    def reset(self) -> None:
+        """Forget observed gaps."""
+        self._average = None
+        self._last_time = None
+
+    def observe(self, event_time: float) -> None:
+        """Account for gap between the previous and the event at `event_time`."""
+        if self._last_time is not None:
+            gap = event_time - self._last_time
+            if self._average is None:
+                self._average = gap
+            else:
+                self._average += self._smoothing * (gap - self._average)
+        self._last_time = event_time
+
+    @property
+    def average_gap(self) -> Optional[float]:
+        """Get average gap between events, None if not enough events observed."""
+        return self._average
+
+    @property
+    def value(self) -> float:
+        """Get current timeout."""
+        if self._average is None:
+            return self._initial
+        return min(max(self._factor * self._average, self.minimum), self.maximum)
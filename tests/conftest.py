@@ -0,0 +1,13 @@
+"""Make modules depending on command line and user config importable in tests.
+
+`voiceassistant.const` parses command line arguments on import,
+and HTTP interface stores its API token in user config directory.
+"""
+
+import os
+import sys
+import tempfile
+
+_USER_PATH = tempfile.mkdtemp()
+os.makedirs(os.path.join(_USER_PATH, ".config", "voiceassistant"))
+sys.argv = [sys.argv[0], "--userpath", _USER_PATH]
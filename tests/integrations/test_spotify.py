@@ -0,0 +1,86 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from voiceassistant.integrations import spotify
+from voiceassistant.integrations.spotify.const import DOMAIN
+
+
+class FakeClient:
+    """Spotify client recording volumes set."""
+
+    def __init__(self):
+        self.volumes = []
+
+    def get_volume(self):
+        return 60
+
+    def set_volume(self, volume):
+        self.volumes.append(volume)
+
+
+@pytest.fixture
+def vass():
+    vass = SimpleNamespace(
+        config={DOMAIN: {spotify.CONF_MUFFLE_FACTOR: 0.5}},
+        data={
+            DOMAIN: {
+                spotify.CLIENT: FakeClient(),
+                spotify.VOLUME_LOWERED: False,
+                spotify.ORIGINAL_VOLUME: 0,
+                spotify.ACTIVITY: spotify.ActivityTracker(),
+            }
+        },
+    )
+    return vass
+
+
+def volumes_set(vass):
+    return vass.data[DOMAIN][spotify.CLIENT].volumes
+
+
+def test_keyword_reply_ending_during_processing_keeps_volume_lowered(vass):
+    spotify.lower_volume_listen.func(vass)
+    spotify.lower_volume_output.func(vass)
+    spotify.increase_volume_output.func(vass)
+    assert volumes_set(vass) == [30]
+
+    spotify.increase_volume_listen.func(vass)
+    assert volumes_set(vass) == [30, 60]
+
+
+def test_processing_ending_during_reply_keeps_volume_lowered(vass):
+    spotify.lower_volume_listen.func(vass)
+    spotify.lower_volume_output.func(vass)
+    spotify.increase_volume_listen.func(vass)
+    assert volumes_set(vass) == [30]
+
+    spotify.increase_volume_output.func(vass)
+    assert volumes_set(vass) == [30, 60]
+
+
+def test_output_and_processing_addons_from_separate_threads(vass):
+    def run(lower, increase):
+        for _ in range(200):
+            lower.func(vass)
+            increase.func(vass)
+
+    threads = [
+        threading.Thread(
+            target=run, args=(spotify.lower_volume_output, spotify.increase_volume_output)
+        ),
+        threading.Thread(
+            target=run, args=(spotify.lower_volume_listen, spotify.increase_volume_listen)
+        ),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    volumes = volumes_set(vass)
+    # volume is lowered and increased back in turns, ending up at original value
+    assert volumes[::2] == [30] * (len(volumes) // 2)
+    assert volumes[1::2] == [60] * (len(volumes) // 2)
+    assert not vass.data[DOMAIN][spotify.VOLUME_LOWERED]
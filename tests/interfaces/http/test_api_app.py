@@ -0,0 +1,45 @@
+from unittest.mock import MagicMock
+
+import pytest
+from flask import Flask
+
+from voiceassistant.interfaces.http.api_app import api_factory
+from voiceassistant.interfaces.http.auth import TOKEN
+from voiceassistant.utils.scheduler import Priority
+
+
+@pytest.fixture
+def vass():
+    return MagicMock()
+
+
+@pytest.fixture
+def client(vass):
+    return api_factory(vass, Flask(__name__)).test_client()
+
+
+def say(client, payload):
+    return client.post("/api/say", json=payload, headers={"token": TOKEN})
+
+
+def test_say_queues_text(client, vass):
+    response = say(client, {"text": "Hello", "priority": "high"})
+
+    assert response.status_code == 200
+    vass.interfaces.speech.enqueue_output.assert_called_once_with("Hello", False, Priority.HIGH)
+
+
+def test_say_queues_one_of_texts(client, vass):
+    response = say(client, {"text": ["Hi", "Hello"]})
+
+    assert response.status_code == 200
+    text = vass.interfaces.speech.enqueue_output.call_args.args[0]
+    assert text in ("Hi", "Hello")
+
+
+@pytest.mark.parametrize("text", [{"en": "Hello"}, [], [["Hello"]], 42, None])
+def test_say_rejects_text_other_than_string(client, vass, text):
+    response = say(client, {"text": text})
+
+    assert response.status_code == 406
+    vass.interfaces.speech.enqueue_output.assert_not_called()
@@ -0,0 +1,129 @@
+import queue
+import threading
+import time
+from unittest.mock import MagicMock
+
+from voiceassistant.interfaces.speech import audio_source
+from voiceassistant.interfaces.speech.audio_source import Playback
+
+CHUNK = 4  # samples
+CHUNK_SIZE = CHUNK * 2
+
+
+def start_playing(playback, cancelled=None):
+    """Play audio put to returned queue until None is put, in background."""
+    generated = queue.Queue()
+    results = []
+
+    audio = iter(generated.get, None)
+    thread = threading.Thread(target=lambda: results.append(playback.play(audio, cancelled)))
+    thread.start()
+    return generated, thread, results
+
+
+def put(generated, chunk):
+    generated.put(chunk)
+    time.sleep(0.02)  # until playback takes it
+
+
+def test_playback_plays_audio_while_it_is_generated():
+    playback = Playback(CHUNK)
+    silence = bytes(CHUNK_SIZE)
+    generated, thread, results = start_playing(playback)
+
+    assert playback.next_chunk() == silence
+    put(generated, b"\x01" * (CHUNK_SIZE + 2))
+    assert playback.next_chunk() == b"\x01" * CHUNK_SIZE
+    # rest of audio is not generated yet
+    assert playback.next_chunk() == silence
+    assert playback.reference == silence
+
+    put(generated, b"\x02" * CHUNK_SIZE)
+    assert playback.next_chunk() == b"\x01" * 2 + b"\x02" * (CHUNK_SIZE - 2)
+    put(generated, None)
+    assert playback.next_chunk() == b"\x02" * 2 + bytes(CHUNK_SIZE - 2)
+
+    thread.join(1)
+    assert results == [True]
+    assert not playback.playing
+
+
+def test_playback_takes_next_chunk_when_it_is_due():
+    playback = Playback(CHUNK)
+    taken = []
+
+    def audio():
+        for chunk in (b"\x01" * 3 * CHUNK_SIZE, b"\x02" * CHUNK_SIZE):
+            taken.append(chunk)
+            yield chunk
+
+    thread = threading.Thread(target=playback.play, args=(audio(),))
+    thread.start()
+    time.sleep(0.02)
+    assert len(taken) == 1
+
+    playback.next_chunk()
+    time.sleep(0.02)
+    assert len(taken) == 1
+    playback.next_chunk()
+    time.sleep(0.02)
+    assert len(taken) == 2
+
+    playback.next_chunk()
+    playback.next_chunk()
+    thread.join(1)
+    assert not playback.playing
+
+
+def test_playback_cancelled_while_audio_is_generated():
+    playback = Playback(CHUNK)
+    generated, thread, results = start_playing(playback)
+
+    put(generated, b"\x01" * CHUNK_SIZE)
+    playback.cancel()
+    put(generated, b"\x02" * CHUNK_SIZE)
+
+    thread.join(1)
+    assert results == [False]
+    assert playback.next_chunk() == bytes(CHUNK_SIZE)
+
+
+def test_playback_cancelled_before_it_starts():
+    playback = Playback(CHUNK)
+    cancelled = threading.Event()
+    cancelled.set()
+    # nothing is playing yet, so this is a no-op
+    playback.cancel()
+
+    audio = MagicMock()
+    assert not playback.play(audio, cancelled)
+    audio.__iter__.return_value.__next__.assert_not_called()
+    assert not playback.playing
+
+
+def test_playback_stops_once_cancelled_event_is_set():
+    playback = Playback(CHUNK)
+    cancelled = threading.Event()
+    generated, thread, results = start_playing(playback, cancelled)
+
+    put(generated, b"\x01" * CHUNK_SIZE * 4)
+    assert playback.next_chunk() == b"\x01" * CHUNK_SIZE
+    cancelled.set()
+    put(generated, b"\x02" * CHUNK_SIZE)
+
+    thread.join(1)
+    assert results == [False]
+    assert playback.next_chunk() == bytes(CHUNK_SIZE)
+
+
+def test_playback_dropped_once_source_stops_taking_audio(monkeypatch):
+    monkeypatch.setattr(audio_source, "SOURCE_STOPPED_SECONDS", 0.1)
+    playback = Playback(CHUNK)
+    generated, thread, results = start_playing(playback)
+
+    put(generated, b"\x01" * 3 * CHUNK_SIZE)
+    put(generated, None)
+
+    thread.join(1)
+    assert results == [False]
+    assert not playback.playing
@@ -0,0 +1,39 @@
+import threading
+from unittest.mock import MagicMock
+
+from voiceassistant.interfaces.speech import SpeechInterface
+
+
+def barge_in_interface():
+    """Get speech interface with only barge-in state, keyword is heard in every chunk."""
+    interface = SpeechInterface.__new__(SpeechInterface)
+    interface._barge_in_lock = threading.Lock()
+    interface._barge_in_position = None
+    interface._barge_in_monitor = None
+
+    detector = MagicMock(trailing_bytes=100)
+    detector.not_detected.return_value = False
+    return interface, detector, MagicMock()
+
+
+def test_keyword_heard_by_monitor_interrupts_output():
+    interface, detector, playback = barge_in_interface()
+    monitor = MagicMock(position=1000)
+    interface._barge_in_monitor = monitor
+
+    interface._detect_barge_in(detector, playback, monitor, memoryview(b""))
+
+    assert interface._barge_in_position == 900
+    assert interface._barge_in_monitor is None
+    playback.cancel.assert_called_once()
+    monitor.close.assert_called_once()
+
+
+def test_keyword_heard_by_monitor_after_waiting_loop_took_over_is_ignored():
+    interface, detector, playback = barge_in_interface()
+    monitor = MagicMock(position=1000)
+
+    interface._detect_barge_in(detector, playback, monitor, memoryview(b""))
+
+    assert interface._barge_in_position is None
+    playback.cancel.assert_not_called()
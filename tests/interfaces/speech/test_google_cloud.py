@@ -0,0 +1,123 @@
+import socket
+import threading
+from concurrent import futures
+from unittest.mock import MagicMock
+
+import grpc
+import pytest
+from google.api_core.exceptions import DeadlineExceeded
+from google.cloud import speech
+
+from voiceassistant.interfaces.speech.stt.google_cloud import GoogleCloudRecognizer
+from voiceassistant.utils.datastruct import DottedDict
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("localhost", 0))
+        return sock.getsockname()[1]
+
+
+def _serve(port):
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=1))
+    server.add_insecure_port(f"localhost:{port}")
+    server.start()
+    return server
+
+
+class ChannelState:
+    """Watch channel connectivity without asking it to connect."""
+
+    def __init__(self, channel):
+        self._channel = channel
+        self._connectivity = None
+        self._condition = threading.Condition()
+        channel.subscribe(self._update)
+
+    def close(self):
+        self._channel.unsubscribe(self._update)
+
+    def _update(self, connectivity):
+        with self._condition:
+            self._connectivity = connectivity
+            self._condition.notify_all()
+
+    def wait_for(self, connectivity, timeout=5):
+        with self._condition:
+            return self._condition.wait_for(lambda: self._connectivity == connectivity, timeout)
+
+    def wait_until_not(self, connectivity, timeout=5):
+        with self._condition:
+            return self._condition.wait_for(lambda: self._connectivity != connectivity, timeout)
+
+
+@pytest.fixture
+def port():
+    return _free_port()
+
+
+@pytest.fixture
+def recognizer(port):
+    vass = MagicMock()
+    vass.config.stt.google_cloud = DottedDict(
+        {"endpoint": f"localhost:{port}", "language_code": "en-US", "max_session_s": 5}
+    )
+    recognizer = GoogleCloudRecognizer(vass, 16000)
+    yield recognizer
+    recognizer.close()
+
+
+@pytest.fixture
+def state(recognizer):
+    state = ChannelState(recognizer._channel)
+    yield state
+    state.close()
+
+
+def test_channel_is_reconnected_once_it_goes_idle(recognizer, state, port):
+    server = _serve(port)
+    recognizer.warm_up()
+    assert state.wait_for(grpc.ChannelConnectivity.READY)
+
+    server.stop(None)
+    assert state.wait_until_not(grpc.ChannelConnectivity.READY)
+    server = _serve(port)
+    try:
+        assert state.wait_for(grpc.ChannelConnectivity.READY)
+    finally:
+        server.stop(None)
+
+
+def test_channel_is_left_idle_once_closed(recognizer, state, port):
+    server = _serve(port)
+    recognizer.warm_up()
+    assert state.wait_for(grpc.ChannelConnectivity.READY)
+
+    recognizer.close()
+    server.stop(None)
+    assert state.wait_until_not(grpc.ChannelConnectivity.READY)
+    server = _serve(port)
+    try:
+        assert not state.wait_for(grpc.ChannelConnectivity.READY, timeout=2)
+    finally:
+        server.stop(None)
+
+
+def test_session_is_capped_at_max_session(recognizer):
+    def responses():
+        result = speech.StreamingRecognitionResult(
+            alternatives=[speech.SpeechRecognitionAlternative(transcript="play")]
+        )
+        yield speech.StreamingRecognizeResponse(results=[result])
+        raise DeadlineExceeded("session time limit")
+
+    recognizer._client = MagicMock()
+    recognizer._client.streaming_recognize.return_value = responses()
+
+    transcripts = list(recognizer.recognize([b"\x00\x00"]))
+
+    assert recognizer._client.streaming_recognize.call_args.kwargs["timeout"] == 5
+    assert [(transcript.strip(), transcript.is_final) for transcript in transcripts] == [
+        ("play", False),
+        ("play", True),
+    ]
@@ -0,0 +1,82 @@
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from voiceassistant.interfaces.speech import keyword
+
+FRAME_LENGTH = 4
+KEYWORD = 1000  # first sample of a frame containing keyword
+
+
+class StubPorcupine:
+    """Detect keyword in frames starting with `KEYWORD` sample."""
+
+    sample_rate = 16000
+    frame_length = FRAME_LENGTH
+
+    def __init__(self):
+        self.frames = []
+
+    def process(self, pcm):
+        assert len(pcm) == FRAME_LENGTH
+        self.frames.append(list(pcm))
+        return 0 if pcm[0] == KEYWORD else -1
+
+
+@pytest.fixture
+def detector(monkeypatch):
+    monkeypatch.setattr(keyword.pvporcupine, "KEYWORDS", ["jarvis"], raising=False)
+    monkeypatch.setattr(keyword.pvporcupine, "create", lambda **kwargs: StubPorcupine())
+    vass = MagicMock()
+    vass.config.triggerword.picovoice.word = "jarvis"
+    return keyword.KeywordDetector(vass)
+
+
+def pcm(*samples):
+    return np.array(samples, dtype=np.int16).tobytes()
+
+
+def test_every_frame_of_chunk_is_processed(detector):
+    assert detector.process(pcm(*range(12))) == -1
+    assert detector._detector.frames == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9, 10, 11]]
+
+
+def test_partial_frame_is_processed_with_next_chunk(detector):
+    assert detector.process(pcm(0, 1, 2)) == -1
+    assert detector._detector.frames == []
+
+    assert detector.process(pcm(3, 4, 5, 6, 7, 8)) == -1
+    assert detector._detector.frames == [[0, 1, 2, 3], [4, 5, 6, 7]]
+
+    detector.process(pcm(9, 10, 11))
+    assert detector._detector.frames[-1] == [8, 9, 10, 11]
+
+
+@pytest.mark.parametrize(
+    "chunks, trailing_samples",
+    [
+        # keyword in the last frame of chunk, nothing follows
+        ([(0, 1, 2, 3, KEYWORD, 5, 6, 7)], 0),
+        # keyword in the first frame, two whole frames and a partial one follow
+        ([(KEYWORD, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13)], 10),
+        # keyword frame starts with samples left over from previous chunk
+        ([(0, 1, 2, 3, KEYWORD, 5), (6, 7, 8, 9, 10)], 3),
+    ],
+)
+def test_trailing_bytes_follow_keyword_frame(detector, chunks, trailing_samples):
+    *previous_chunks, last_chunk = chunks
+    for chunk in previous_chunks:
+        assert detector.process(pcm(*chunk)) == -1
+
+    assert detector.process(pcm(*last_chunk)) == 0
+    assert detector.trailing_bytes == trailing_samples * 2
+    assert pcm(*last_chunk)[len(pcm(*last_chunk)) - detector.trailing_bytes :] == pcm(
+        *last_chunk[len(last_chunk) - trailing_samples :]
+    )
+
+
+def test_samples_after_keyword_are_not_carried_over(detector):
+    assert detector.process(pcm(KEYWORD, 1, 2, 3, 4, 5)) == 0
+    detector.process(pcm(6, 7, 8, 9))
+    assert detector._detector.frames[-1] == [6, 7, 8, 9]
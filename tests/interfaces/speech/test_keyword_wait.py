@@ -0,0 +1,61 @@
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from voiceassistant import addons
+from voiceassistant.addons.create import CoreAttribute, addon_end
+from voiceassistant.exceptions import AudioStreamClosed
+from voiceassistant.interfaces.speech import SpeechInterface
+
+
+@pytest.fixture
+def interface():
+    """Get speech interface waiting for keyword, which is never detected."""
+    interface = SpeechInterface.__new__(SpeechInterface)
+    interface._vass = MagicMock()
+    interface._barge_in_lock = threading.Lock()
+    interface._barge_in_position = None
+    interface._barge_in_monitor = None
+    interface._playback = None
+    interface.sst = MagicMock()
+    interface.keyword_detector = MagicMock()
+    interface.keyword_detector.not_detected.return_value = True
+    return interface
+
+
+@pytest.fixture
+def keyword_reactions(monkeypatch):
+    reactions = []
+    monkeypatch.setitem(
+        addons._ADDONS_END,
+        CoreAttribute.KEYWORD_WAIT,
+        [addon_end(CoreAttribute.KEYWORD_WAIT)(lambda vass: reactions.append(vass))],
+    )
+    return reactions
+
+
+def test_closed_stream_ends_waiting_without_keyword_reaction(interface, keyword_reactions):
+    stream = MagicMock(closed=True)
+
+    with pytest.raises(AudioStreamClosed):
+        interface._wait_for_trigger(stream)
+
+    assert keyword_reactions == []
+    interface.sst.prepare.assert_not_called()
+
+
+def test_remote_trigger_ends_waiting_with_keyword_reaction(interface, keyword_reactions):
+    stream = MagicMock(closed=False, position=0)
+    stream.seconds.return_value = 0.0
+    interface._vass.config.get.return_value = "keyword"
+
+    def trigger():
+        interface._not_triggered = False
+        return b""
+
+    stream.read.side_effect = trigger
+    interface._wait_for_trigger(stream)
+
+    assert keyword_reactions == [interface._vass]
+    interface.sst.prepare.assert_called_once_with(stream, 0)
@@ -0,0 +1,149 @@
+import threading
+import time
+
+import pytest
+
+from voiceassistant.interfaces.speech.audio_source import AudioSource
+from voiceassistant.interfaces.speech.microphone_stream import AudioCaptureEngine, DropPolicy
+
+RATE = 16000
+CHUNK = 160  # samples, 10 ms
+CHUNK_SIZE = CHUNK * 2
+
+
+class FakeSource(AudioSource):
+    """Audio source producing chunks only when test pushes them."""
+
+    def __init__(self):
+        super().__init__(RATE, CHUNK)
+        self._callback = None
+        self._pushed = 0
+
+    def start(self, callback):
+        self._callback = callback
+
+    def push(self, num_chunks=1):
+        """Push chunks filled with their sequence number."""
+        for _ in range(num_chunks):
+            self._callback(bytes([self._pushed % 256]) * CHUNK_SIZE)
+            self._pushed += 1
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def source():
+    return FakeSource()
+
+
+@pytest.fixture
+def engine(source):
+    engine = AudioCaptureEngine(source, buffer_seconds=1)
+    yield engine
+    engine.close()
+
+
+def chunk_numbers(audio):
+    return list(bytes(audio)[::CHUNK_SIZE])
+
+
+def push_later(source, num_chunks, interval):
+    def push():
+        for _ in range(num_chunks):
+            time.sleep(interval)
+            source.push()
+
+    threading.Thread(target=push, daemon=True).start()
+
+
+def test_read_returns_audio_buffered_by_deadline(engine, source):
+    stream = engine.stream(0)
+    source.push(2)
+
+    start = time.monotonic()
+    audio = stream.read(min_size=5 * CHUNK_SIZE, max_wait=0.05)
+
+    assert 0.04 < time.monotonic() - start < 0.5
+    assert chunk_numbers(audio) == [0, 1]
+
+
+def test_read_returns_once_min_size_is_buffered(engine, source):
+    stream = engine.stream(0)
+    push_later(source, 3, interval=0.01)
+
+    start = time.monotonic()
+    audio = stream.read(min_size=3 * CHUNK_SIZE, max_wait=1)
+
+    assert time.monotonic() - start < 0.5
+    assert chunk_numbers(audio) == [0, 1, 2]
+
+
+def test_read_is_capped_at_max_size(engine, source):
+    stream = engine.stream(0)
+    source.push(5)
+
+    assert chunk_numbers(stream.read(max_size=2 * CHUNK_SIZE)) == [0, 1]
+    assert chunk_numbers(stream.read(max_size=2 * CHUNK_SIZE)) == [2, 3]
+    assert chunk_numbers(stream.read(max_size=2 * CHUNK_SIZE)) == [4]
+
+
+def test_generator_yields_requests_of_target_size(engine, source):
+    stream = engine.stream(0)
+    source.push(7)
+    generator = stream.generator(2 * CHUNK_SIZE, max_wait=0.01, max_size=2 * CHUNK_SIZE)
+
+    assert [chunk_numbers(next(generator)) for _ in range(4)] == [[0, 1], [2, 3], [4, 5], [6]]
+
+
+def test_oldest_drop_policy_resumes_within_allowed_lag(engine, source):
+    stream = engine.stream(0, drop_policy=DropPolicy.OLDEST, max_lag_sec=0.05)
+    source.push(8)
+
+    assert chunk_numbers(stream.read()) == [3, 4, 5, 6, 7]
+    assert stream.stats.dropped == 3 * CHUNK_SIZE
+    assert stream.stats.max_lag == 8 * CHUNK_SIZE
+
+
+def test_latest_drop_policy_skips_whole_backlog(engine, source):
+    stream = engine.stream(0, name="latest", drop_policy=DropPolicy.LATEST, max_lag_sec=0.05)
+    source.push(8)
+
+    assert chunk_numbers(stream.read()) == []
+    assert stream.stats.dropped == 8 * CHUNK_SIZE
+
+    source.push()
+    assert chunk_numbers(stream.read()) == [8]
+
+
+def test_streams_keep_own_positions(engine, source):
+    first = engine.stream(0, name="first")
+    source.push(2)
+    second = engine.stream(0, name="second")
+    source.push()
+
+    assert chunk_numbers(first.read()) == [0, 1, 2]
+    assert chunk_numbers(second.read()) == [2]
+
+
+def test_interrupt_ends_waiting_read(engine, source):
+    stream = engine.stream(0)
+    threading.Timer(0.02, stream.interrupt).start()
+
+    assert chunk_numbers(stream.read(min_size=CHUNK_SIZE)) == []
+
+
+def test_subscriber_is_called_with_its_stream(engine, source):
+    called = []
+    done = threading.Event()
+
+    def callback(stream, chunk):
+        called.append((stream, chunk_numbers(chunk)))
+        done.set()
+
+    subscribed = engine.subscribe(callback, name="subscriber")
+    source.push()
+    assert done.wait(1)
+    subscribed.close()
+
+    assert called == [(subscribed, [0])]
@@ -0,0 +1,156 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from voiceassistant.interfaces.speech import speech_to_text
+from voiceassistant.interfaces.speech.speech_to_text import SpeechToText
+from voiceassistant.interfaces.speech.stt.base import SpeechRecognizer
+from voiceassistant.utils.datastruct import DottedDict, RecognitionString
+
+RATE = 16000
+
+
+class FakeStream:
+    """Microphone stream without audio, closed by speech-to-text."""
+
+    def __init__(self):
+        self.closed = threading.Event()
+
+    def generator(self, *args, **kwargs):
+        return iter([])
+
+    def close(self):
+        self.closed.set()
+
+
+class FakeRecognizer(SpeechRecognizer):
+    """Recognizer generating interim transcripts after scripted delays until stream is closed."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.script = []
+
+    def recognize(self, audio):
+        for delay, text in self.script:
+            if self.stream.closed.wait(delay):
+                return
+            yield RecognitionString(text, is_final=False)
+        self.stream.closed.wait(5)
+
+
+@pytest.fixture
+def stream():
+    stream = FakeStream()
+    yield stream
+    stream.close()
+
+
+@pytest.fixture
+def recognizer(stream):
+    return FakeRecognizer(stream)
+
+
+@pytest.fixture
+def config():
+    return {"silence_ms": 500, "min_silence_ms": 100, "max_silence_ms": 800}
+
+
+@pytest.fixture
+def sst(monkeypatch, recognizer, config):
+    monkeypatch.setattr(speech_to_text, "load_backend", lambda name, vass, rate: recognizer)
+    vass = MagicMock()
+    vass.config.stt = DottedDict(config)
+    vad = MagicMock()
+    vad.endpoint.side_effect = lambda chunks, keyword_bytes=0: chunks
+    return SpeechToText(vass, RATE, vad)
+
+
+def recognize(sst, stream, react=lambda sst, transcript: None):
+    """Get transcripts with times they were generated at, relative to session start."""
+    start = time.monotonic()
+    transcripts = []
+    for transcript in sst.recognize_from_stream(stream):
+        transcripts.append((transcript, transcript.is_final, time.monotonic() - start))
+        react(sst, transcript)
+    return transcripts
+
+
+def test_session_ends_after_initial_silence_if_user_is_not_talking(sst, stream):
+    ((transcript, is_final, end),) = recognize(sst, stream)
+
+    assert is_final
+    assert 0.5 <= end < 0.7
+    assert stream.closed.is_set()
+
+
+def test_silence_timeout_adapts_to_fast_paced_transcripts(sst, stream, recognizer):
+    recognizer.script = [(0.05, "turn"), (0.05, "turn on"), (0.05, "turn on the"), (0.05, "lamp")]
+
+    transcripts = recognize(sst, stream)
+
+    assert [(text, is_final) for text, is_final, _ in transcripts] == [
+        ("turn", False),
+        ("turn on", False),
+        ("turn on the", False),
+        ("lamp", False),
+        ("lamp", True),
+    ]
+    # end of speech is three average gaps after last transcript, not initial silence
+    silence = transcripts[-1][2] - transcripts[-2][2]
+    assert 0.1 <= silence < 0.4
+
+
+def test_finished_request_ends_session_right_away(sst, stream, recognizer):
+    recognizer.script = [(0.05, "lights off"), (0.05, "lights off please")]
+
+    transcripts = recognize(sst, stream, lambda sst, transcript: sst.finish())
+
+    assert [text for text, _, _ in transcripts] == ["lights off"]
+    assert stream.closed.is_set()
+
+
+@pytest.mark.parametrize("config", [{"grace_ms": 300}])
+def test_transcript_within_grace_window_continues_session(sst, stream, recognizer):
+    recognizer.script = [(0.05, "lights off"), (0.2, "lights off and music on")]
+    finished = []
+
+    def finish_first(sst, transcript):
+        if not finished:
+            finished.append(transcript)
+            sst.finish()
+
+    transcripts = recognize(sst, stream, finish_first)
+
+    assert [(text, is_final) for text, is_final, _ in transcripts] == [
+        ("lights off", False),
+        ("lights off and music on", False),
+        ("lights off and music on", True),
+    ]
+
+
+@pytest.mark.parametrize("config", [{"grace_ms": 200}])
+def test_session_ends_once_grace_window_passes(sst, stream, recognizer):
+    recognizer.script = [(0.05, "lights off")]
+
+    transcripts = recognize(sst, stream, lambda sst, transcript: sst.finish())
+
+    assert [(text, is_final) for text, is_final, _ in transcripts] == [
+        ("lights off", False),
+        ("lights off", True),
+    ]
+    assert 0.2 <= transcripts[-1][2] - transcripts[0][2] < 0.4
+
+
+def test_pending_request_waits_for_longest_silence(sst, stream, recognizer):
+    recognizer.script = [(0.05, "set timer"), (0.05, "set timer for"), (0.5, "set timer for 5")]
+
+    def expect_more(sst, transcript):
+        if transcript == "set timer for":
+            sst.expect_more()
+
+    transcripts = recognize(sst, stream, expect_more)
+
+    # pause after pending request is longer than adapted timeout, shorter than the longest
+    assert ("set timer for 5", False) in [(text, is_final) for text, is_final, _ in transcripts]
@@ -0,0 +1,63 @@
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from voiceassistant.interfaces.speech.vad import VoiceActivityDetector
+
+RATE = 16000
+CHUNK = 1600  # samples, 100 ms
+
+
+@pytest.fixture
+def vad():
+    vass = MagicMock()
+    vass.config.get.return_value = {}
+    return VoiceActivityDetector(vass, RATE)
+
+
+def audio(*segments):
+    """Get audio of (seconds, is_speech) segments: loud noise for speech, quiet one otherwise."""
+    rng = np.random.default_rng(0)
+    return np.concatenate(
+        [
+            rng.normal(0, 3000 if is_speech else 30, int(seconds * RATE)).astype(np.int16)
+            for seconds, is_speech in segments
+        ]
+    ).tobytes()
+
+
+def chunks(audio):
+    view = memoryview(audio)
+    return [view[start : start + CHUNK * 2] for start in range(0, len(audio), CHUNK * 2)]
+
+
+def seconds(generated):
+    return sum(len(chunk) for chunk in generated) / 2 / RATE
+
+
+KEYWORD_PAUSE_REQUEST = audio((0.2, False), (0.6, True), (1.0, False), (1.5, True), (2.0, False))
+KEYWORD_END = int(0.8 * RATE) * 2
+
+
+def test_endpoint_ends_speech_after_silence(vad):
+    generated = list(vad.endpoint(chunks(audio((0.5, False), (1.0, True), (2.0, False)))))
+    # padding before onset, speech, then silence until end of speech is detected
+    assert seconds(generated) == pytest.approx(0.3 + 1.0 + 0.5, abs=0.1)
+
+
+def test_endpoint_waits_for_request_after_keyword(vad):
+    generated = list(vad.endpoint(chunks(KEYWORD_PAUSE_REQUEST), KEYWORD_END))
+    assert seconds(generated) == pytest.approx(0.2 + 0.6 + 1.0 + 1.5 + 0.5, abs=0.1)
+
+
+def test_endpoint_without_keyword_offset_ends_at_pause_after_keyword(vad):
+    generated = list(vad.endpoint(chunks(KEYWORD_PAUSE_REQUEST)))
+    assert seconds(generated) == pytest.approx(0.2 + 0.6 + 0.5, abs=0.1)
+
+
+def test_endpoint_streams_silence_after_keyword_until_stopped(vad):
+    keyword_only = audio((0.2, False), (0.6, True), (3.0, False))
+    generated = list(vad.endpoint(chunks(keyword_only), KEYWORD_END))
+    # recognition waits for user to start talking, not VAD
+    assert seconds(generated) == pytest.approx(3.8, abs=0.1)
@@ -0,0 +1,73 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from voiceassistant.nlp import ContinuousLanguageHandler
+from voiceassistant.nlp.regex import RegexIntent
+from voiceassistant.utils.datastruct import RecognitionString
+
+
+@pytest.fixture
+def handler():
+    lights = RegexIntent("lights", ["(turn on&&lights)"])
+    music = RegexIntent("music", ["(play&&music)"])
+
+    processor = MagicMock()
+    processor.process.side_effect = lambda text: lights.match(text) or music.match(text)
+
+    vass = MagicMock()
+    with ContinuousLanguageHandler(vass, MagicMock(), (processor,)) as handler:
+        yield handler
+
+
+def handle(handler, text, is_final=False):
+    handler.handle_next(RecognitionString(text, is_final=is_final))
+    return [call.kwargs["name"] for call in handler._vass.skills.run.call_args_list]
+
+
+def test_handler_is_complete_after_intent_runs(handler):
+    assert handle(handler, "turn on") == []
+    assert not handler.is_complete
+
+    assert handle(handler, "turn on the lights") == ["lights"]
+    assert handler.is_complete
+
+    assert handle(handler, "turn on the lights") == ["lights"]
+    assert handler.is_complete
+
+
+def test_handler_is_not_complete_while_user_chains_commands(handler):
+    handle(handler, "turn on the lights")
+    assert handler.is_complete
+
+    handle(handler, "turn on the lights and")
+    assert not handler.is_complete
+
+    assert handle(handler, "turn on the lights and play music") == ["lights", "music"]
+    assert handler.is_complete
+
+
+def test_handler_is_not_complete_if_intent_ends_with_continuation_word(handler):
+    handle(handler, "turn on lights and")
+    assert not handler.is_complete
+
+
+def test_handler_is_pending_while_intent_has_not_enough_info():
+    search = RegexIntent("search", ["google for <<query>>"])
+    processor = MagicMock()
+    processor.process.side_effect = search.match
+
+    with ContinuousLanguageHandler(MagicMock(), MagicMock(), (processor,)) as handler:
+        handle(handler, "google")
+        assert not handler.is_pending
+
+        assert handle(handler, "google for weather") == []
+        assert handler.is_pending
+
+        assert handle(handler, "google for weather in london", is_final=True) == ["search"]
+        assert not handler.is_pending
+
+
+def test_handler_is_pending_while_user_chains_commands(handler):
+    handle(handler, "turn on the lights and")
+    assert handler.is_pending
@@ -0,0 +1,124 @@
+import numpy as np
+import pytest
+
+from voiceassistant.utils.audio import (
+    ChannelSelector,
+    DelayAndSumBeamformer,
+    EchoCanceller,
+    deinterleave,
+    energy_db,
+    pcm16_frames,
+    resample,
+    zero_crossing_rate,
+)
+
+RESPEAKER_4_MIC = [[-0.032, 0], [0, -0.032], [0.032, 0], [0, 0.032]]
+
+
+def plane_wave(signal, rate, direction, mic_positions):
+    """Get `signal` as recorded by each mic from far-field source in `direction`."""
+    angle = np.radians(direction)
+    delays = -(np.array(mic_positions) @ [np.cos(angle), np.sin(angle)]) / 343.0
+    frequencies = np.fft.rfftfreq(len(signal), 1 / rate)
+    spectra = np.fft.rfft(signal) * np.exp(-2j * np.pi * delays[:, None] * frequencies)
+    return np.fft.irfft(spectra, n=len(signal), axis=1)
+
+
+@pytest.mark.parametrize(
+    "num_samples, frame_length, expected_shape",
+    [
+        (320, 160, (2, 160)),
+        (500, 160, (3, 160)),
+        (100, 160, (0, 160)),
+    ],
+)
+def test_pcm16_frames_drops_incomplete_frame(num_samples, frame_length, expected_shape):
+    audio = np.zeros(num_samples, dtype=np.int16).tobytes()
+    assert pcm16_frames(audio, frame_length).shape == expected_shape
+
+
+def test_energy_db_is_higher_for_louder_frames():
+    frames = np.array([[0, 0, 0, 0], [100, -100, 100, -100], [1000, -1000, 1000, -1000]])
+    energy = energy_db(frames)
+    assert energy[0] == 0
+    assert energy[0] < energy[1] < energy[2]
+
+
+def test_zero_crossing_rate():
+    frames = np.array([[1, -1, 1, -1, 1], [1, 2, 3, 4, 5], [1, 1, -1, -1, 1]])
+    assert zero_crossing_rate(frames).tolist() == [1.0, 0.0, 0.5]
+
+
+def test_deinterleave():
+    audio = np.array([1, 10, 2, 20, 3, 30], dtype=np.int16).tobytes()
+    assert deinterleave(audio, 2).tolist() == [[1, 2, 3], [10, 20, 30]]
+
+
+def test_resample_keeps_duration_and_tone():
+    from_rate, to_rate = 22050, 16000
+    times = np.arange(from_rate) / from_rate
+    tone = (10000 * np.sin(2 * np.pi * 440 * times)).astype(np.int16)
+
+    resampled = np.frombuffer(resample(tone.tobytes(), from_rate, to_rate), dtype=np.int16)
+
+    assert resampled.size == to_rate
+    spectrum = np.abs(np.fft.rfft(resampled))
+    assert np.fft.rfftfreq(resampled.size, 1 / to_rate)[np.argmax(spectrum)] == 440
+    assert resample(tone.tobytes(), to_rate, to_rate) == tone.tobytes()
+
+
+@pytest.mark.parametrize("direction", [0, 90, 230])
+def test_beamformer_steers_to_source_and_reduces_noise(direction):
+    rng = np.random.default_rng(0)
+    rate, chunk = 16000, 512
+    beamformer = DelayAndSumBeamformer(RESPEAKER_4_MIC, rate)
+
+    for _ in range(50):
+        speech = rng.normal(0, 2000, chunk)
+        noise = rng.normal(0, 2000, (4, chunk))
+        signals = plane_wave(speech, rate, direction, RESPEAKER_4_MIC) + noise
+        output = beamformer.process(signals.astype(np.int16))
+
+    assert abs((beamformer.direction - direction + 180) % 360 - 180) <= 10
+    assert output.dtype == np.int16
+    # uncorrelated noise of 4 mics is attenuated by averaging
+    assert np.std(output - speech) < 0.7 * np.std(noise[0])
+
+
+def test_channel_selector_picks_loudest_channel():
+    rng = np.random.default_rng(0)
+    selector = ChannelSelector()
+    signals = (rng.normal(0, 100, (4, 512)) * [[1], [1], [5], [1]]).astype(np.int16)
+
+    assert selector.process(signals).tolist() == signals[2].tolist()
+
+
+def test_echo_canceller_removes_echo_and_keeps_speech():
+    rng = np.random.default_rng(0)
+    block, num_blocks = 512, 50
+    canceller = EchoCanceller(block, num_blocks=4)
+
+    played = rng.normal(0, 3000, block * num_blocks)
+    echo_path = rng.normal(0, 1, 800) * np.exp(-np.arange(800) / 150) * 0.1
+    echo = np.convolve(played, echo_path)[: len(played)]
+    speech = np.zeros_like(played)
+    speech[-block * 5 :] = rng.normal(0, 1000, block * 5)
+    recorded = (echo + speech).astype(np.int16)
+
+    output = np.concatenate(
+        [
+            canceller.process(recorded[i : i + block], played[i : i + block].astype(np.int16))
+            for i in range(0, len(played), block)
+        ]
+    )
+
+    converged = slice(-block * 10, -block * 5)
+    assert np.std(output[converged]) < 0.1 * np.std(echo[converged])
+    # near-end speech passes through echo canceller
+    assert np.std(output[-block * 5 :] - speech[-block * 5 :]) < 0.3 * np.std(speech[-block * 5 :])
+
+
+def test_echo_canceller_passes_audio_through_when_nothing_is_played():
+    canceller = EchoCanceller(4, num_blocks=2)
+    mic = np.array([1, 2, 3, 4], dtype=np.int16)
+    assert canceller.process(mic, np.zeros(4, dtype=np.int16)) is mic
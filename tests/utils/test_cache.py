@@ -0,0 +1,46 @@
+from voiceassistant.utils.cache import AudioCache
+
+
+def test_key_depends_on_all_params():
+    key = AudioCache.key(text="hello", voice="Joanna", engine="standard")
+
+    assert key == AudioCache.key(engine="standard", voice="Joanna", text="hello")
+    assert key != AudioCache.key(text="hello", voice="Brian", engine="standard")
+    assert key != AudioCache.key(text="hel lo", voice="Joanna", engine="standard")
+
+
+def test_hits_and_misses_are_counted(tmp_path):
+    cache = AudioCache(str(tmp_path), size_limit=2**20)
+    key = AudioCache.key(text="hello")
+
+    assert cache.get(key) is None
+    cache.set(key, b"audio")
+    assert cache.get(key) == b"audio"
+    assert key in cache
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+
+def test_least_recently_used_audio_is_evicted(tmp_path):
+    audio = bytes(100_000)
+    base_size = AudioCache(str(tmp_path), size_limit=2**20).stats()["bytes"]
+    cache = AudioCache(str(tmp_path), size_limit=base_size + 15 * len(audio) + 50_000)
+
+    for index in range(15):
+        cache.set(str(index), audio)
+    cache.get("0")
+    cache.set("15", audio)
+
+    assert "0" in cache
+    assert "1" not in cache
+    assert "15" in cache
+
+
+def test_size_limit_is_kept(tmp_path):
+    size_limit = 2 * 2**20
+    cache = AudioCache(str(tmp_path), size_limit=size_limit)
+
+    for index in range(40):
+        cache.set(str(index), bytes(50_000 + index * 10_000))
+        assert cache.stats()["bytes"] <= size_limit
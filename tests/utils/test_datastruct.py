@@ -0,0 +1,45 @@
+import pytest
+
+from voiceassistant.utils.datastruct import RingBuffer
+
+
+@pytest.mark.parametrize(
+    "capacity, writes, start, expected",
+    [
+        (8, [b"abc", b"def"], 0, b"abcdef"),
+        (8, [b"abcdef", b"ghij"], 2, b"cdefghij"),
+        (4, [b"abcdefgh"], 4, b"efgh"),
+        (5, [b"abc", b"def", b"ghi"], 4, b"efghi"),
+    ],
+)
+def test_ring_buffer_view_returns_written_bytes(capacity, writes, start, expected):
+    buffer = RingBuffer(capacity)
+    for data in writes:
+        buffer.write(data)
+
+    assert buffer.view(start, buffer.head) == expected
+
+
+def test_ring_buffer_overwrites_oldest_bytes():
+    buffer = RingBuffer(4)
+    buffer.write(b"abcdef")
+
+    assert buffer.head == 6
+    assert buffer.tail == 2
+
+    with pytest.raises(IndexError):
+        buffer.view(0, buffer.head)
+
+
+def test_ring_buffer_wait_returns_on_close():
+    buffer = RingBuffer(4)
+    buffer.close()
+
+    assert not buffer.wait(0)
+
+
+def test_ring_buffer_wait_returns_on_interruption():
+    buffer = RingBuffer(4)
+
+    assert not buffer.wait(0, timeout=5, interrupted=lambda: True)
+    assert not buffer.wait(0, timeout=0.01, interrupted=lambda: False)
@@ -0,0 +1,65 @@
+import threading
+import time
+
+import pytest
+
+from voiceassistant.utils.hedge import Hedge
+
+
+def source(items, delay=0.0, error=None, closed=None):
+    def factory():
+        time.sleep(delay)
+        if error:
+            raise error
+        try:
+            yield from items
+        finally:
+            if closed:
+                closed.set()
+
+    return factory
+
+
+def test_primary_within_deadline():
+    hedge = Hedge(source([1, 2]), source(["fallback"]), deadline=1)
+    assert list(hedge) == [1, 2]
+    assert hedge.used_fallback is False
+
+
+def test_fallback_after_deadline_and_late_primary_is_discarded():
+    closed = threading.Event()
+    hedge = Hedge(source([1, 2], delay=0.3, closed=closed), source(["fallback"]), deadline=0.05)
+
+    assert list(hedge) == ["fallback"]
+    assert hedge.used_fallback is True
+    assert closed.wait(1)
+
+
+def test_primary_wins_if_faster_than_fallback_after_deadline():
+    hedge = Hedge(source([1], delay=0.1), source(["fallback"], delay=1), deadline=0.05)
+    assert list(hedge) == [1]
+    assert hedge.used_fallback is False
+
+
+def test_fallback_once_primary_fails():
+    start_time = time.monotonic()
+    hedge = Hedge(source([1], error=ValueError("offline")), source(["fallback"]), deadline=1)
+
+    assert list(hedge) == ["fallback"]
+    assert time.monotonic() - start_time < 0.5
+
+
+def test_primary_error_is_raised_if_both_fail():
+    hedge = Hedge(
+        source([1], error=ValueError("offline")),
+        source([2], error=RuntimeError("missing")),
+        deadline=0.05,
+    )
+    with pytest.raises(ValueError):
+        list(hedge)
+
+
+def test_no_fallback():
+    hedge = Hedge(source([1], delay=0.1), None, deadline=0.01)
+    assert list(hedge) == [1]
+    assert hedge.used_fallback is False
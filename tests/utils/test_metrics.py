@@ -0,0 +1,31 @@
+import pytest
+
+from voiceassistant.utils.metrics import Histogram
+
+
+def test_histogram_counts_values_in_buckets():
+    histogram = Histogram([0.01, 0.1, 1])
+    for value in (0.005, 0.01, 0.05, 0.5, 5):
+        histogram.add(value)
+
+    summary = histogram.as_dict()
+    assert summary["buckets"] == {"le_0.01": 2, "le_0.1": 1, "le_1": 1, "le_inf": 1}
+    assert summary["count"] == 5
+    assert summary["max"] == 5
+    assert summary["mean"] == pytest.approx(1.113)
+
+
+def test_histogram_percentiles():
+    histogram = Histogram([1, 2, 3])
+    for value in [0.5] * 90 + [2.5] * 9 + [10]:
+        histogram.add(value)
+
+    assert histogram.percentile(50) == 1
+    assert histogram.percentile(95) == 3
+    assert histogram.percentile(100) == 10
+
+
+def test_empty_histogram():
+    histogram = Histogram([1])
+    assert histogram.percentile(50) == 0
+    assert histogram.as_dict()["mean"] == 0
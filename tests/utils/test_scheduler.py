@@ -0,0 +1,85 @@
+import threading
+
+from voiceassistant.utils.scheduler import Priority, SerialScheduler
+
+
+def _blocked_scheduler(ran, interrupt=None):
+    """Get scheduler running a job that blocks until released."""
+    scheduler = SerialScheduler("test", interrupt=interrupt)
+    started, release = threading.Event(), threading.Event()
+
+    def block(cancelled):
+        started.set()
+        release.wait(5)
+        ran.append("blocking")
+
+    blocking = scheduler.submit("blocking", block)
+    started.wait(5)
+    return scheduler, blocking, release
+
+
+def test_jobs_run_by_priority_then_in_order():
+    ran = []
+    scheduler, _, release = _blocked_scheduler(ran)
+
+    jobs = [
+        scheduler.submit(name, lambda cancelled, name=name: ran.append(name), priority)
+        for name, priority in [
+            ("low", Priority.LOW),
+            ("first", Priority.NORMAL),
+            ("error", Priority.HIGH),
+            ("second", Priority.NORMAL),
+        ]
+    ]
+    assert scheduler.pending == 4
+    release.set()
+
+    assert all(job.wait(5) for job in jobs)
+    assert ran == ["blocking", "error", "first", "second", "low"]
+    scheduler.close()
+
+
+def test_identical_waiting_jobs_are_merged():
+    ran = []
+    scheduler, _, release = _blocked_scheduler(ran)
+
+    first = scheduler.submit("hello", lambda cancelled: ran.append("hello"), Priority.LOW)
+    scheduler.submit("other", lambda cancelled: ran.append("other"))
+    second = scheduler.submit("hello", lambda cancelled: ran.append("hello"), Priority.HIGH)
+    assert first is second
+    release.set()
+
+    assert first.wait(5)
+    scheduler.submit("end", lambda cancelled: None).wait(5)
+    assert ran == ["blocking", "hello", "other"]
+    scheduler.close()
+
+
+def test_cancelled_jobs_do_not_run():
+    ran = []
+    scheduler, _, release = _blocked_scheduler(ran)
+
+    job = scheduler.submit("hello", lambda cancelled: ran.append("hello"))
+    job.cancel()
+    assert job.wait(0)
+    release.set()
+
+    scheduler.submit("end", lambda cancelled: None).wait(5)
+    assert ran == ["blocking"]
+    scheduler.close()
+
+
+def test_running_job_is_interrupted():
+    interrupted = threading.Event()
+    ran = []
+    scheduler, blocking, release = _blocked_scheduler(ran, interrupt=interrupted.set)
+
+    scheduler.submit("queued", lambda cancelled: ran.append("queued"))
+    scheduler.cancel_all()
+    assert interrupted.is_set()
+    assert blocking.cancelled.is_set()
+    release.set()
+
+    scheduler.submit("end", lambda cancelled: None).wait(5)
+    assert ran == ["blocking"]
+    scheduler.close()
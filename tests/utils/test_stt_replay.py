@@ -0,0 +1,59 @@
+import os
+import socket
+import time
+
+import grpc
+import pytest
+
+from voiceassistant.utils.stt_replay import (
+    STREAMING_RECOGNIZE,
+    SessionRecorder,
+    load_recordings,
+    serve,
+)
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("localhost", 0))
+        return sock.getsockname()[1]
+
+
+def _record_session(directory):
+    recording = SessionRecorder(str(directory), rate=16000).start()
+    for _ in recording.record_audio([b"\x00\x01" * 160] * 3):
+        pass
+    recording.add_response(b"first")
+    time.sleep(0.2)
+    recording.add_response(b"second")
+    recording.save()
+    return recording
+
+
+def test_recording_is_saved(tmp_path):
+    recording = _record_session(tmp_path)
+
+    assert os.path.exists(f"{recording.path}.wav")
+    (loaded,) = load_recordings([str(tmp_path)])
+    assert loaded["rate"] == 16000
+    assert [request["size"] for request in loaded["requests"]] == [320] * 3
+    assert len(loaded["responses"]) == 2
+
+
+def test_responses_are_replayed_with_timing(tmp_path):
+    _record_session(tmp_path)
+    port = _free_port()
+    server = serve(load_recordings([str(tmp_path)]), port)
+
+    try:
+        with grpc.insecure_channel(f"localhost:{port}") as channel:
+            call = channel.stream_stream(STREAMING_RECOGNIZE)
+            start_time = time.monotonic()
+            responses = []
+            for response in call(iter([b"audio"]), timeout=5):
+                responses.append((response, time.monotonic() - start_time))
+    finally:
+        server.stop(None)
+
+    assert [response for response, _ in responses] == [b"first", b"second"]
+    assert responses[1][1] - responses[0][1] == pytest.approx(0.2, abs=0.1)
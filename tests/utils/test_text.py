@@ -0,0 +1,17 @@
+from voiceassistant.utils.text import split_sentences
+
+
+def test_split_sentences():
+    text = " It's 21.5 degrees outside. Want more?  Sure! Light rain; wind "
+    assert split_sentences(text) == [
+        "It's 21.5 degrees outside.",
+        "Want more?",
+        "Sure!",
+        "Light rain;",
+        "wind",
+    ]
+
+
+def test_split_single_sentence():
+    assert split_sentences("turning on the lights") == ["turning on the lights"]
+    assert split_sentences("") == []
@@ -0,0 +1,39 @@
+import pytest
+
+from voiceassistant.utils.timeout import AdaptiveTimeout
+
+
+def test_timeout_is_initial_until_gap_is_observed():
+    timeout = AdaptiveTimeout(initial=2, minimum=0.5, maximum=4)
+    assert timeout.value == 2
+
+    timeout.observe(10.0)
+    assert timeout.value == 2
+
+
+def test_timeout_follows_average_gap_within_bounds():
+    timeout = AdaptiveTimeout(initial=2, minimum=0.5, maximum=4, factor=3, smoothing=0.5)
+    for event_time in (0, 0.3, 0.6):
+        timeout.observe(event_time)
+    assert timeout.value == pytest.approx(0.9)
+
+    timeout.observe(0.7)
+    assert timeout.value == pytest.approx(0.6)
+
+    for event_time in (0.75, 0.8, 0.85):
+        timeout.observe(event_time)
+    assert timeout.value == 0.5
+
+    for event_time in (3, 6, 9):
+        timeout.observe(event_time)
+    assert timeout.value == 4
+
+
+def test_timeout_reset():
+    timeout = AdaptiveTimeout(initial=2, minimum=0.5, maximum=4)
+    timeout.observe(0)
+    timeout.observe(0.1)
+    timeout.reset()
+
+    assert timeout.average_gap is None
+    assert timeout.value == 2
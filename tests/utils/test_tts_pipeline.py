@@ -0,0 +1,107 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from voiceassistant.interfaces.speech import text_to_speech
+from voiceassistant.interfaces.speech.text_to_speech import TextToSpeech
+from voiceassistant.interfaces.speech.tts import SpeechSynthesizer
+from voiceassistant.utils.datastruct import DottedDict
+
+RATE = 16000
+
+
+class FakeSynthesizer(SpeechSynthesizer):
+    """Speech synthesizer producing sentence text as audio, after a per-sentence delay."""
+
+    def __init__(self, name, delays=None):
+        self.name = name
+        self.delays = delays or {}
+        self.started = []
+
+    @property
+    def cache_params(self):
+        return {"voice": self.name}
+
+    def stream(self, text, sample_rate):
+        self.started.append(text)
+        time.sleep(self.delays.get(text, 0))
+        yield f"{self.name}:{text}|".encode()
+
+
+@pytest.fixture
+def backends():
+    return {"polly": FakeSynthesizer("polly"), "espeak": FakeSynthesizer("espeak")}
+
+
+@pytest.fixture
+def tts(monkeypatch, tmp_path, backends):
+    monkeypatch.setattr(text_to_speech, "load_backend", lambda name, vass: backends[name])
+    vass = MagicMock()
+    vass.config.tts = DottedDict({"backend": "polly", "fallback": "espeak", "deadline_ms": 200})
+    vass.cache.directory = str(tmp_path)
+
+    tts = TextToSpeech(vass, MagicMock(rate=RATE))
+    yield tts
+    tts.close()
+
+
+def test_sentences_are_played_in_order(tts, backends):
+    # later sentences are synthesized faster than the first one
+    backends["polly"].delays = {"One.": 0.15, "Two.": 0.05}
+
+    audio = b"".join(tts.speech("One. Two. Three.", cache=True))
+
+    assert audio == b"polly:One.|polly:Two.|polly:Three.|"
+    assert b"".join(tts.speech("One. Two. Three.")) == audio  # cached
+
+
+def test_stopping_playback_cancels_synthesis_of_later_sentences(tts, backends):
+    sentences = [f"Sentence {i}." for i in range(6)]
+    backends["polly"].delays = {sentence: 0.2 for sentence in sentences[1:]}
+
+    speech = iter(tts.speech(" ".join(sentences), cache=True))
+    next(speech)
+    speech.close()
+    time.sleep(0.5)
+
+    # workers were busy with the next sentences, the rest wasn't started
+    assert len(backends["polly"].started) == 1 + text_to_speech.PIPELINE_WORKERS
+    assert tts.cache.stats()["entries"] == 0
+
+
+def test_late_sentence_is_spoken_by_fallback_with_rest_of_reply(tts, backends):
+    backends["polly"].delays = {"Two.": 1}
+
+    audio = b"".join(tts.speech("One. Two. Three.", cache=True))
+
+    assert audio == b"polly:One.|espeak:Two.|espeak:Three.|"
+    assert tts.cache.stats()["entries"] == 0
+
+
+def test_sentence_deadline_counts_from_when_it_is_due(tts, backends):
+    backends["polly"].delays = {"Two.": 0.3}
+    speech = iter(tts.speech("One. Two."))
+    assert next(speech) == b"polly:One.|"
+
+    # playing the first sentence takes longer than synthesis of the second one
+    time.sleep(0.2)
+    assert next(speech) == b"polly:Two.|"
+
+
+def test_failure_without_fallback_is_raised(tts, backends):
+    tts.fallback = None
+    failed = threading.Event()
+
+    def fail(text, sample_rate):
+        if text == "Two.":
+            failed.set()
+            raise RuntimeError("no connection")
+        yield b"audio"
+
+    backends["polly"].stream = fail
+
+    with pytest.raises(RuntimeError):
+        b"".join(tts.speech("One. Two."))
+    assert failed.is_set()